@@ -23,6 +23,13 @@ create table if not exists disciplinas (
   unique (codigo, turma)
 );
 
+-- id estável do professor (uuid5 do nome canônico, ver scraper/resolve_professores.py)
+alter table disciplinas add column if not exists professor_id uuid;
+
+-- cursos com vaga na turma e periodo/tipo/pré-requisitos em cada um (scraper/enrich_materias.py)
+alter table disciplinas add column if not exists cursos jsonb not null default '[]';
+alter table disciplinas add column if not exists por_curso jsonb not null default '{}';
+
 create index if not exists disciplinas_codigo_idx on disciplinas (codigo);
 create index if not exists disciplinas_tipo_idx   on disciplinas (tipo);
 create index if not exists disciplinas_periodo_idx on disciplinas (periodo);
@@ -79,32 +86,82 @@ create table if not exists email_submissions (
 
 create index if not exists email_submissions_professor_idx
   on email_submissions (professor_id);
-create index if not exists email_submissions_consensus_idx
-  on email_submissions (professor_id, email_submitted);
+-- O consenso agora é lido de email_votes; o índice só servia ao count(*) antigo
+drop index if exists email_submissions_consensus_idx;
 
 -- RLS: sem policy de select pública (contém IPs)
 alter table email_submissions enable row level security;
 
+-- ══════════════════════════════════════════════════
+-- Contagem incremental de votos por (professor, email)
+-- ══════════════════════════════════════════════════
+
+create table if not exists email_votes (
+  professor_id uuid not null references professors(id) on delete cascade,
+  email        text not null,
+  votos        integer not null default 0,
+
+  primary key (professor_id, email)
+);
+
+-- RLS: sem policy pública (derivado de email_submissions)
+alter table email_votes enable row level security;
+
+-- Reconstrói a contagem a partir das submissões existentes (idempotente)
+insert into email_votes (professor_id, email, votos)
+select professor_id, email_submitted, count(*)
+from email_submissions
+group by professor_id, email_submitted
+on conflict (professor_id, email) do update set votos = excluded.votos;
+
 -- ══════════════════════════════════════════════════
 -- Trigger: validação por consenso (3 votos iguais)
 -- ══════════════════════════════════════════════════
 
+-- Mantém email_votes a cada insert/update/delete em vez de refazer um
+-- count(*) sobre email_submissions: custo constante por submissão.
 create or replace function check_email_consensus()
 returns trigger as $$
 declare
   matching_count int;
 begin
-  select count(*)
-  into matching_count
-  from email_submissions
-  where professor_id = NEW.professor_id
-    and email_submitted = NEW.email_submitted;
+  if TG_OP = 'UPDATE' then
+    if OLD.professor_id = NEW.professor_id
+       and OLD.email_submitted = NEW.email_submitted then
+      return NEW;  -- mesmo voto reenviado: contagem não muda
+    end if;
+
+    -- Trava as duas contagens em ordem fixa (evita deadlock entre trocas opostas)
+    perform 1
+    from email_votes
+    where (professor_id, email) in ((OLD.professor_id, OLD.email_submitted),
+                                    (NEW.professor_id, NEW.email_submitted))
+    order by professor_id, email
+    for update;
+  end if;
+
+  if TG_OP in ('UPDATE', 'DELETE') then
+    update email_votes
+    set votos = votos - 1
+    where professor_id = OLD.professor_id
+      and email = OLD.email_submitted;
+  end if;
+
+  if TG_OP = 'DELETE' then
+    return OLD;
+  end if;
+
+  insert into email_votes as v (professor_id, email, votos)
+  values (NEW.professor_id, NEW.email_submitted, 1)
+  on conflict (professor_id, email) do update set votos = v.votos + 1
+  returning votos into matching_count;
 
   if matching_count >= 3 then
     update professors
     set email = NEW.email_submitted,
         updated_at = now()
-    where id = NEW.professor_id;
+    where id = NEW.professor_id
+      and email is distinct from NEW.email_submitted;
   end if;
 
   return NEW;
@@ -113,6 +170,59 @@ $$ language plpgsql security definer;
 
 drop trigger if exists trg_check_email_consensus on email_submissions;
 create trigger trg_check_email_consensus
-  after insert or update on email_submissions
+  after insert or update or delete on email_submissions
   for each row
   execute function check_email_consensus();
+
+-- ══════════════════════════════════════════════════
+-- Migração de ids de professores
+-- ══════════════════════════════════════════════════
+
+-- professors.id é o id estável de scraper/resolve_professores.py (uuid5).
+-- Linhas antigas (gen_random_uuid) ou de outra grafia do mesmo docente são
+-- movidas para o id estável por scraper/upload_to_supabase.py antes do upsert.
+create or replace function migrar_professor_id(antigo uuid, novo uuid)
+returns void as $$
+declare
+  nome text;
+begin
+  select name into nome from professors where id = antigo;
+  if nome is null or antigo = novo then
+    return;
+  end if;
+
+  if not exists (select 1 from professors where id = novo) then
+    insert into professors (id, name, email, created_at, updated_at)
+    select novo, name || ' [' || novo || ']', email, created_at, updated_at
+    from professors
+    where id = antigo;
+  end if;
+
+  -- Mesmo IP votou nas duas linhas: fica o voto já registrado em `novo`
+  delete from email_submissions s
+  where s.professor_id = antigo
+    and exists (
+      select 1 from email_submissions n
+      where n.professor_id = novo and n.ip = s.ip
+    );
+
+  -- O trigger de consenso move cada voto em email_votes para o novo id
+  update email_submissions set professor_id = novo where professor_id = antigo;
+  delete from email_votes where professor_id = antigo;
+  delete from professors where id = antigo;
+  update professors set name = nome where id = novo;
+end;
+$$ language plpgsql security definer;
+
+-- Só o service role (upload) chama a migração. anon/authenticated existem no
+-- Supabase mas não num Postgres local (scraper/benchmark_consenso.py)
+revoke execute on function migrar_professor_id(uuid, uuid) from public;
+
+do $$ begin
+  if exists (select 1 from pg_roles where rolname = 'anon') then
+    revoke execute on function migrar_professor_id(uuid, uuid) from anon;
+  end if;
+  if exists (select 1 from pg_roles where rolname = 'authenticated') then
+    revoke execute on function migrar_professor_id(uuid, uuid) from authenticated;
+  end if;
+end $$;
@@ -0,0 +1,84 @@
+"""
+benchmark_modelos.py — compara carga/gravação de db_disciplinas.json com dicts e com modelos.py.
+
+Replica o catálogo atual N vezes (padrão: 200, ~26 mil turmas, a escala da
+universidade inteira) num diretório temporário e mede, em cada forma, o ciclo
+que toda etapa do pipeline faz: carregar o JSON e gravá-lo de volta
+(json.dump com indent=2, como antes; salvar_turmas no modelo).
+
+Uso:
+    python scraper/benchmark_modelos.py [--copias 200] [--repeticoes 5]
+"""
+
+import argparse
+import json
+import pathlib
+import tempfile
+import time
+
+from modelos import carregar_turmas, salvar_turmas
+
+ROOT = pathlib.Path(__file__).parent.parent
+DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
+
+
+def _melhor(f, repeticoes: int):
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        resultado = None  # libera a rodada anterior fora da medição
+        inicio = time.perf_counter()
+        resultado = f()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def run(json_path=None, copias=200, repeticoes=5):
+    with pathlib.Path(json_path or DEFAULT_JSON).open(encoding="utf-8") as f:
+        catalogo = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        origem = pathlib.Path(tmp) / "db_disciplinas.json"
+        destino = pathlib.Path(tmp) / "saida.json"
+        grande = [dict(d, turma=f"{d['turma']}{i}") for i in range(copias) for d in catalogo]
+        with origem.open("w", encoding="utf-8") as f:
+            json.dump(grande, f, ensure_ascii=False, indent=2)
+        del grande
+
+        def carregar_dicts():
+            with origem.open(encoding="utf-8") as f:
+                return json.load(f)
+
+        def gravar_dicts():
+            with destino.open("w", encoding="utf-8") as f:
+                json.dump(dicts, f, ensure_ascii=False, indent=2)
+
+        carga_d, dicts = _melhor(carregar_dicts, repeticoes)
+        grav_d, _ = _melhor(gravar_dicts, repeticoes)
+        carga_m, turmas = _melhor(lambda: carregar_turmas(origem), repeticoes)
+        grav_m, _ = _melhor(lambda: salvar_turmas(turmas, destino), repeticoes)
+
+        # Mesmo conteúdo da entrada e mesmos bytes que json.dump(indent=2) dos
+        # dicts do modelo (a ordem das chaves segue a dos campos de Turma)
+        saida = destino.read_text(encoding="utf-8")
+        referencia = json.dumps([t.to_dict() for t in turmas], ensure_ascii=False, indent=2)
+        identico = saida == referencia and json.loads(saida) == dicts
+
+    print(f"[INFO] {len(turmas)} turmas ({copias}x o catálogo), melhor de {repeticoes}")
+    print(f"  carga  : dicts {carga_d:.3f}s | modelos {carga_m:.3f}s")
+    print(f"  gravação: dicts {grav_d:.3f}s | modelos {grav_m:.3f}s")
+    print(f"  ciclo  : dicts {carga_d + grav_d:.3f}s | modelos {carga_m + grav_m:.3f}s")
+    print(f"  [{'OK' if identico else '!'}] saída {'equivalente' if identico else 'DIFERENTE'} (conteúdo e formato)")
+    return {"carga": (carga_d, carga_m), "gravacao": (grav_d, grav_m), "identico": identico}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga/gravação: dicts x modelos.py.")
+    parser.add_argument("--json", default=None, help="padrão: web/data/db_disciplinas.json")
+    parser.add_argument("--copias", type=int, default=200)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    run(args.json, args.copias, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
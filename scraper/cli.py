@@ -0,0 +1,173 @@
+"""
+cli.py — ponto de entrada único do pipeline de dados.
+
+Uso:
+    python scraper/cli.py scrape        # login + quadro de horários (Playwright) e pipeline completo
+    python scraper/cli.py parse-csv     # CSV do quadro → db_disciplinas.json
+    python scraper/cli.py fetch-ch      # CH e docentes das páginas das turmas
+    python scraper/cli.py professores   # unifica grafias de docentes
+    python scraper/cli.py matriz        # PDF da matriz → matriz_curricular.json
+    python scraper/cli.py enrich        # período, tipo e pré/co-requisitos
+    python scraper/cli.py export        # docs/grade_horarios.csv + assets com hash em web/public/data
+    python scraper/cli.py upload        # sincroniza com o Supabase
+    python scraper/cli.py snapshot      # grava o semestre/curso atual em docs/snapshots (Parquet)
+    python scraper/cli.py historico     # consultas sobre os snapshots (--codigo / --carga-docente)
+    python scraper/cli.py simular-cr    # cenários de CR a partir de um histórico (NumPy)
+
+Cada subcomando importa apenas o módulo da sua etapa, e esses módulos só
+carregam dependências pesadas (Playwright, BeautifulSoup, requests, supabase,
+anthropic) e variáveis de ambiente dentro das funções que as usam. Etapas
+rápidas como enrich e export iniciam sem pagar esse custo.
+"""
+
+import argparse
+import sys
+
+
+def _scrape(args):
+    import scrape_uff
+    scrape_uff.main()
+
+
+def _parse_csv(args):
+    import parse_csv
+    parse_csv.run(csv_path=args.csv, out_path=args.json)
+
+
+def _fetch_ch(args):
+    import scrape_ch
+    scrape_ch.run(json_path=args.json)
+
+
+def _professores(args):
+    import resolve_professores
+    resolve_professores.run(json_path=args.json)
+
+
+def _matriz(args):
+    import parse_matriz
+    try:
+        parse_matriz.run(paginas_por_parte=args.paginas_por_parte, workers=args.workers)
+    except (parse_matriz.ExtracaoInvalida, RuntimeError, FileNotFoundError) as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
+
+
+def _enrich(args):
+    import enrich_materias
+    enrich_materias.run(matriz_paths=args.matriz)
+
+
+def _export(args):
+    import export_assets
+    import scrape_uff
+    scrape_uff._write_amostra_csv()
+    export_assets.run()
+
+
+def _upload(args):
+    import upload_to_supabase
+    upload_to_supabase.main()
+
+
+def _snapshot(args):
+    import snapshots
+    snapshots.run(anosemestre=args.anosemestre, curso=args.curso)
+
+
+def _historico(args):
+    import snapshots
+    from modelos import DIAS
+    if args.codigo:
+        for linha in snapshots.turmas_por_codigo(args.codigo, ultimos=args.ultimos, curso=args.curso):
+            horarios = " ".join(f"{dia}:{linha[dia]}" for dia in DIAS if linha[dia])
+            print(f"  {linha['anosemestre']} {linha['turma']:<4} {str(linha['docente']):<40} {horarios}")
+    if args.carga_docente:
+        recentes = snapshots.semestres()[-args.ultimos:]
+        for linha in snapshots.carga_docente(recentes, curso=args.curso).to_pylist():
+            print(f"  {linha['anosemestre']} {linha['docente']:<40} {linha['turmas']:>2} turmas {linha['ch_total']:>4}h")
+
+
+def _simular_cr(args):
+    import simulador_cr
+    if not args.planejadas and not args.planos:
+        print("ERRO: informe --planejadas ou --planos")
+        sys.exit(1)
+    if simulador_cr.em_lote(args.historico, args.planos):
+        simulador_cr.run_lote(args.historico, args.planejadas, args.planos, args.alvo, args.cenarios,
+                              args.nota_min, args.seed, args.saida)
+    else:
+        simulador_cr.run(args.historico[0], args.planejadas, args.alvo, args.cenarios, args.nota_min, args.seed)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Pipeline de dados do UFF Helper.")
+    sub = parser.add_subparsers(dest="comando", required=True, metavar="comando")
+
+    p = sub.add_parser("scrape", help="login + quadro de horários e pipeline completo")
+    p.set_defaults(func=_scrape)
+
+    p = sub.add_parser("parse-csv", help="CSV do quadro → db_disciplinas.json")
+    p.add_argument("--csv", default=None, help="CSV de entrada (padrão: docs/grade_horarios.csv)")
+    p.add_argument("--json", default=None, help="JSON de saída (padrão: web/data/db_disciplinas.json)")
+    p.set_defaults(func=_parse_csv)
+
+    p = sub.add_parser("fetch-ch", help="CH e docentes das páginas das turmas")
+    p.add_argument("--json", default=None, help="padrão: web/data/db_disciplinas.json")
+    p.set_defaults(func=_fetch_ch)
+
+    p = sub.add_parser("professores", help="unifica grafias de docentes (ids estáveis)")
+    p.add_argument("--json", default=None, help="padrão: web/data/db_disciplinas.json")
+    p.set_defaults(func=_professores)
+
+    p = sub.add_parser("matriz", help="PDF da matriz → matriz_curricular.json")
+    p.add_argument("--paginas-por-parte", type=int, default=None,
+                   help="divide o PDF em trechos de N páginas enviados em paralelo")
+    p.add_argument("--workers", type=int, default=4, help="trechos simultâneos (padrão: 4)")
+    p.set_defaults(func=_matriz)
+
+    p = sub.add_parser("enrich", help="período, tipo e pré/co-requisitos das matrizes")
+    p.add_argument("--matriz", action="append", default=None,
+                   help="[CURSO=]matriz curricular (repetível; a primeira é o curso principal)")
+    p.set_defaults(func=_enrich)
+
+    p = sub.add_parser("export", help="docs/grade_horarios.csv e assets minificados/comprimidos com hash")
+    p.set_defaults(func=_export)
+
+    p = sub.add_parser("upload", help="sincroniza db_disciplinas.json com o Supabase")
+    p.set_defaults(func=_upload)
+
+    p = sub.add_parser("snapshot", help="grava o semestre/curso atual em docs/snapshots (Parquet)")
+    p.add_argument("--anosemestre", default=None, help="padrão: ANOSEMESTRE de scrape_uff.py")
+    p.add_argument("--curso", default=None, help="padrão: ID_CURSO de scrape_uff.py")
+    p.set_defaults(func=_snapshot)
+
+    p = sub.add_parser("historico", help="turmas de uma disciplina ou carga docente ao longo dos semestres")
+    p.add_argument("--codigo", default=None, help="turmas desta disciplina")
+    p.add_argument("--carga-docente", action="store_true", help="turmas e CH por docente em cada semestre")
+    p.add_argument("--ultimos", type=int, default=6, help="últimos N semestres (padrão: 6)")
+    p.add_argument("--curso", default=None, help="restringe a um curso (id)")
+    p.set_defaults(func=_historico)
+
+    p = sub.add_parser("simular-cr", help="cenários de CR e notas mínimas para um CR alvo")
+    p.add_argument("historico", nargs="+",
+                   help="histórico em .csv (formato da calculadora de CR); vários ou um diretório = lote")
+    p.add_argument("--planejadas", nargs="+", default=None, help="códigos das disciplinas planejadas")
+    p.add_argument("--planos", default=None, help="lote: planos.csv com `aluno;CODIGO1 CODIGO2 ...`")
+    p.add_argument("--alvo", type=float, default=None, help="CR alvo")
+    p.add_argument("--cenarios", type=int, default=10000)
+    p.add_argument("--nota-min", type=float, default=5.0, help="menor nota sorteada (padrão: 5)")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--saida", default=None, help="lote: CSV com distribuição e notas mínimas por aluno")
+    p.set_defaults(func=_simular_cr)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
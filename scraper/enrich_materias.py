@@ -1,49 +1,149 @@
 """
-enrich_materias.py — enriquece web/data/db_disciplinas.json com dados da matriz curricular.
+enrich_materias.py — enriquece web/data/db_disciplinas.json com dados das matrizes curriculares.
 Adiciona periodo, tipo (obrigatoria/optativa) e prerequisitos a cada matéria.
+
+Aceita várias matrizes (uma por curso): docs/matriz_curricular/matriz_curricular.json
+e, se existirem, docs/matriz_curricular/cursos/*.json. Cada matéria recebe `por_curso`
+com periodo/tipo/pré/co-requisitos em cada curso que a oferece; os campos de topo
+continuam vindo do curso principal (a primeira matriz).
+
+O curso de cada matriz vem de uma fonte explícita, nunca do nome_faculdade
+extraído do PDF: o rótulo em `--matriz CURSO=caminho`, o campo "curso" do JSON,
+o nome do arquivo em cursos/ (GEOGRAFIA.json → GEOGRAFIA) ou, para a matriz
+principal, scrape_uff.NOME_CURSO. Deve bater com os nomes de "Curso(s) com vagas"
+das turmas.
 """
 
 import json
 import pathlib
 import sys
 
-ROOT = pathlib.Path(__file__).parent.parent
-
+from modelos import Disciplina, carregar_matriz, carregar_turmas, salvar_turmas
 
-def run():
-    """Lê matriz_curricular.json e enriquece materias.json."""
+ROOT = pathlib.Path(__file__).parent.parent
+MATRIZ_DIR = ROOT / "docs" / "matriz_curricular"
+
+
+def _curso_key(nome: str) -> str:
+    return " ".join(nome.upper().split())
+
+
+def matrizes_padrao() -> list[pathlib.Path]:
+    """Matriz principal primeiro, depois as dos demais cursos em ordem alfabética."""
+    return [MATRIZ_DIR / "matriz_curricular.json", *sorted((MATRIZ_DIR / "cursos").glob("*.json"))]
+
+
+def _separar_rotulo(valor) -> tuple[str | None, pathlib.Path]:
+    """'GEOGRAFIA=cursos/geo.json' -> ('GEOGRAFIA', Path('cursos/geo.json'))."""
+    if isinstance(valor, str):
+        rotulo, sep, caminho = valor.partition("=")
+        if sep and rotulo.strip():
+            return rotulo, pathlib.Path(caminho)
+    return None, pathlib.Path(valor)
+
+
+def _curso_da_matriz(path: pathlib.Path, metadados: dict, rotulo=None, principal=False) -> str | None:
+    """Chave do curso de uma matriz: rótulo, campo "curso", arquivo em cursos/ ou NOME_CURSO."""
+    if rotulo:
+        return _curso_key(rotulo)
+    if metadados.get("curso"):
+        return _curso_key(metadados["curso"])
+    if path.parent.name == "cursos":
+        return _curso_key(path.stem.replace("_", " "))
+    if principal:
+        import scrape_uff
+        return _curso_key(scrape_uff.NOME_CURSO)
+    return None
+
+
+def carregar_equivalencias(equiv_json: pathlib.Path) -> dict[str, str]:
+    """Carrega equivalências (código quadro → código matriz)."""
+    if not equiv_json.exists():
+        return {}
+    with equiv_json.open(encoding="utf-8") as f:
+        raw = json.load(f)
+    return {k: v for k, v in raw.items() if k != "_comentario"}
+
+
+def construir_indice(
+    matrizes: list[tuple[str, list[Disciplina]]], equivalencias: dict[str, str]
+) -> dict[str, dict[str, Disciplina]]:
+    """Índice codigo → {curso: Disciplina}, a partir de [(curso, disciplinas)].
+
+    As equivalências são resolvidas aqui, uma única vez: o código do quadro
+    passa a apontar para a disciplina equivalente em cada curso onde ele não
+    tem entrada própria (a Disciplina guarda o código da matriz).
+    """
+    indice: dict[str, dict[str, Disciplina]] = {}
+    for curso, disciplinas in matrizes:
+        for d in disciplinas:
+            indice.setdefault(d.codigo, {}).setdefault(curso, d)
+
+    for codigo_quadro, codigo_matriz in equivalencias.items():
+        por_curso = indice.get(codigo_matriz)
+        if not por_curso:
+            continue
+        destino = indice.setdefault(codigo_quadro, {})
+        for curso, d in por_curso.items():
+            destino.setdefault(curso, d)
+    return indice
+
+
+def run(matriz_paths=None):
+    """Lê as matrizes curriculares e enriquece materias.json em uma única passada."""
     web_json = ROOT / "web" / "data" / "db_disciplinas.json"
-    matriz_json = ROOT / "docs" / "matriz_curricular" / "matriz_curricular.json"
+    if matriz_paths is None:
+        matriz_paths = matrizes_padrao()
+    rotulados = [_separar_rotulo(p) for p in matriz_paths]
+    matriz_paths = [path for _, path in rotulados]
 
     print(f"  Lendo {web_json.name}...")
-    with web_json.open(encoding="utf-8") as f:
-        materias = json.load(f)
+    materias = carregar_turmas(web_json)
 
-    print(f"  Lendo {matriz_json.name}...")
-    if not matriz_json.exists():
+    if not matriz_paths[0].exists():
         print(
-            f"ERRO: {matriz_json} não encontrado. "
+            f"ERRO: {matriz_paths[0]} não encontrado. "
             "Execute parse_matriz.py primeiro."
         )
         sys.exit(1)
 
-    with matriz_json.open(encoding="utf-8") as f:
-        matriz = json.load(f)
-
-    # Carrega equivalências (código quadro → código matriz)
-    equiv_json = ROOT / "docs" / "matriz_curricular" / "equivalencias.json"
-    equivalencias = {}
-    if equiv_json.exists():
-        with equiv_json.open(encoding="utf-8") as f:
-            raw = json.load(f)
-        equivalencias = {k: v for k, v in raw.items() if k != "_comentario"}
+    matrizes = []
+    origem: dict[str, pathlib.Path] = {}
+    for i, (rotulo, path) in enumerate(rotulados):
+        print(f"  Lendo {path.name}...")
+        metadados, disciplinas = carregar_matriz(path)
+        curso = _curso_da_matriz(path, metadados, rotulo, principal=i == 0)
+        if not curso:
+            print(
+                f"ERRO: não há curso definido para {path}. "
+                'Use --matriz CURSO=caminho ou o campo "curso" no JSON.'
+            )
+            sys.exit(1)
+        if curso in origem:
+            print(f"ERRO: {origem[curso]} e {path} são ambas do curso '{curso}'.")
+            sys.exit(1)
+        origem[curso] = path
+        matrizes.append((curso, disciplinas))
+
+    equivalencias = carregar_equivalencias(MATRIZ_DIR / "equivalencias.json")
+    if equivalencias:
         print(f"  {len(equivalencias)} equivalências carregadas")
 
-    # Extrai lista de disciplinas (novo schema: objeto com chave "disciplinas")
-    disciplinas_matriz = matriz["disciplinas"] if isinstance(matriz, dict) else matriz
-
-    # Cria índice por código para lookup rápido
-    matriz_map = {d["codigo"]: d for d in disciplinas_matriz}
+    indice = construir_indice(matrizes, equivalencias)
+    cursos = [curso for curso, _ in matrizes]
+    principal = cursos[0]
+    print(f"  Índice: {len(indice)} códigos em {len(cursos)} curso(s) (principal: {principal})")
+
+    # Um curso que não aparece em nenhuma turma quase sempre é nome diferente
+    # do usado em "Curso(s) com vagas": o filtro abaixo o descartaria calado
+    com_vagas = {_curso_key(c) for m in materias for c in m.cursos or ()}
+    if com_vagas:
+        for curso in cursos:
+            if curso not in com_vagas:
+                print(
+                    f"  [!] Aviso: o curso '{curso}' ({origem[curso].name}) não aparece nos cursos "
+                    "com vagas de nenhuma turma; confira o nome."
+                )
 
     # Merge: adiciona periodo, tipo, prerequisitos a cada matéria
     enriquecidas = 0
@@ -51,29 +151,28 @@ def run():
     sem_match = 0
 
     for m in materias:
-        codigo = m["codigo"]
-        # Tenta match direto, depois por equivalência
-        lookup = codigo if codigo in matriz_map else equivalencias.get(codigo)
-        if lookup and lookup in matriz_map:
-            d = matriz_map[lookup]
-            m["periodo"] = d["periodo"]
-            m["tipo"] = d["tipo"]
-            m["prerequisitos"] = d["prerequisitos"]
-            m["corequisitos"] = d.get("corequisitos", [])
+        entradas = indice.get(m.codigo, {})
+        # Restringe aos cursos com vaga na turma, quando a listagem informa.
+        # O principal é o curso filtrado no SEARCH_URL, então sempre se aplica.
+        ofertados = {_curso_key(c) for c in m.cursos or ()}
+        if ofertados:
+            entradas = {c: d for c, d in entradas.items() if c in ofertados or c == principal}
+
+        m.por_curso = {c: d.dados_curso() for c, d in entradas.items()}
+
+        # Topo vem só do curso principal; fora dele, os padrões (optativa, sem
+        # período) — os outros cursos aparecem apenas em por_curso
+        d = entradas.get(principal)
+        m.aplicar_disciplina(d)
+        if d is not None:
             enriquecidas += 1
-            if lookup != codigo:
+            if d.codigo != m.codigo:
                 por_equiv += 1
         else:
-            # Padrão para matérias não encontradas na matriz
-            m["periodo"] = None
-            m["tipo"] = "optativa"
-            m["prerequisitos"] = []
-            m["corequisitos"] = []
             sem_match += 1
 
     # Salva resultado
-    with web_json.open("w", encoding="utf-8") as f:
-        json.dump(materias, f, ensure_ascii=False, indent=2)
+    salvar_turmas(materias, web_json)
 
     print(
         f"  {len(materias)} matérias enriquecidas "
@@ -0,0 +1,131 @@
+"""
+export_assets.py — etapa final: publica os JSONs de web/data como assets estáticos.
+
+Para cada arquivo de dados, grava em web/public/data/:
+  - <nome>.<hash>.json     JSON minificado, com hash do conteúdo no nome
+  - <nome>.<hash>.json.gz  pré-comprimido (gzip -9)
+  - <nome>.<hash>.json.br  pré-comprimido (brotli q11, se o pacote estiver instalado)
+
+e escreve web/data/assets_manifest.json (nome lógico → URL), que o app importa
+em tempo de build (web/lib/dataAssets.ts). Como o nome muda junto com o
+conteúdo, os arquivos podem ser servidos com cache imutável (next.config.mjs).
+O app sempre pede o .json; os .gz/.br ao lado são para servidores/CDNs que
+entregam versões pré-comprimidas conforme o Accept-Encoding (ex: gzip_static
+e brotli_static do nginx) — os demais comprimem na hora.
+
+Versões anteriores não somem no mesmo export: HTML de um deploy antigo ainda
+em cache continua apontando para elas. Ficam as MANTER_VERSOES mais recentes
+além da atual (--manter N); as mais velhas são removidas.
+
+Uso:
+    python scraper/export_assets.py [--manter 3]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import pathlib
+
+ROOT = pathlib.Path(__file__).parent.parent
+DATA_DIR = ROOT / "web" / "data"
+OUT_DIR = ROOT / "web" / "public" / "data"
+MANIFEST = DATA_DIR / "assets_manifest.json"
+URL_PREFIX = "/data"
+ASSETS = ("db_disciplinas.json", "matriz_curricular.json", "nomes_professores.json")
+HASH_LEN = 10
+MANTER_VERSOES = 3  # versões anteriores de cada arquivo mantidas em web/public/data
+
+
+def _gravar(path: pathlib.Path, conteudo: bytes):
+    """Grava só se ainda não existir: o nome com hash já garante o conteúdo.
+
+    Se já existir, só atualiza o mtime: ele marca a última vez que a versão foi
+    publicada, o que decide quais versões antigas são removidas.
+    """
+    if path.exists():
+        path.touch()
+    else:
+        path.write_bytes(conteudo)
+
+
+def _podar(stem: str, atual: str, manter: int) -> int:
+    """Remove as versões de `stem` além da atual e das `manter` publicadas mais recentemente."""
+    versoes: dict[str, list[pathlib.Path]] = {}
+    for arq in OUT_DIR.glob(f"{stem}.*.json*"):
+        versoes.setdefault(arq.name.split(".")[1], []).append(arq)
+    versoes.pop(atual, None)
+
+    def publicada_em(arquivos):
+        return max(a.stat().st_mtime for a in arquivos)
+
+    antigas = sorted(versoes.values(), key=publicada_em, reverse=True)[manter:]
+    for arquivos in antigas:
+        for arq in arquivos:
+            arq.unlink()
+    return len(antigas)
+
+
+def run(assets=ASSETS, manter=MANTER_VERSOES):
+    """Minifica, comprime e versiona os JSONs de web/data; atualiza o manifest."""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("  [!] Aviso: pacote 'brotli' não instalado — gerando só .gz. Rode: pip install brotli")
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, dict] = {}
+
+    for nome in assets:
+        src = DATA_DIR / nome
+        if not src.exists():
+            print(f"  [!] {src} não encontrado — ignorado.")
+            continue
+
+        with src.open(encoding="utf-8") as f:
+            dados = json.load(f)
+        mini = json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(mini).hexdigest()
+        hashed = f"{src.stem}.{digest[:HASH_LEN]}.json"
+
+        gz = gzip.compress(mini, compresslevel=9, mtime=0)
+        _gravar(OUT_DIR / hashed, mini)
+        _gravar(OUT_DIR / f"{hashed}.gz", gz)
+        br = None
+        if brotli is not None:
+            br = brotli.compress(mini, quality=11)
+            _gravar(OUT_DIR / f"{hashed}.br", br)
+        removidas = _podar(src.stem, digest[:HASH_LEN], manter)
+
+        manifest[nome] = {
+            "path": f"{URL_PREFIX}/{hashed}",
+            "sha256": digest,
+            "bytes": len(mini),
+            "gzip": len(gz),
+            "br": len(br) if br is not None else None,
+        }
+        original = src.stat().st_size
+        print(
+            f"  [OK] {nome} -> {hashed} | {original / 1024:.1f} KiB -> min {len(mini) / 1024:.1f} KiB"
+            f" | gz {len(gz) / 1024:.1f} KiB" + (f" | br {len(br) / 1024:.1f} KiB" if br is not None else "")
+            + (f" | {removidas} versão(ões) antiga(s) removida(s)" if removidas else "")
+        )
+
+    with MANIFEST.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"  [OK] Manifest com {len(manifest)} assets em {MANIFEST.relative_to(ROOT)}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica os JSONs de web/data como assets com hash.")
+    parser.add_argument("--manter", type=int, default=MANTER_VERSOES,
+                        help=f"versões anteriores mantidas por arquivo (padrão: {MANTER_VERSOES})")
+    args = parser.parse_args()
+    run(manter=args.manter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+modelos.py — registros tipados de turmas e disciplinas, usados por todas as etapas.
+
+Turma e Disciplina usam __slots__ (sem __dict__ por instância), strings
+internadas e tuplas de pré/co-requisitos compartilhadas entre registros, o que
+reduz a memória em execuções com a universidade inteira. Os horários ficam
+numa tupla indexada por DIAS em vez de um dict por turma.
+
+`carregar_turmas`/`salvar_turmas` leem e gravam o mesmo JSON de
+web/data/db_disciplinas.json — o contrato de dados não muda. A gravação não
+passa por dicts intermediários nem pelo encoder Python do json (usado sempre
+que há indent): cada turma é escrita direto dos atributos, com as tuplas e
+grades compartilhadas serializadas uma vez só. A saída é byte a byte igual a
+json.dump(..., ensure_ascii=False, indent=2) dos dicts de to_dict.
+"""
+
+import gc
+import json
+import pathlib
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from json.encoder import encode_basestring as _str_json
+from operator import attrgetter, itemgetter
+
+DIAS = ("seg", "ter", "qua", "qui", "sex", "sab")
+
+
+class _Ausente:
+    """Campo que não existe no JSON (diferente de null)."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "AUSENTE"
+
+    def __bool__(self):
+        return False
+
+
+AUSENTE = _Ausente()
+
+_TUPLAS: dict[tuple, tuple] = {}
+_HORARIOS: dict[tuple, dict] = {}
+
+
+def tupla(valores) -> tuple[str, ...]:
+    """Tupla de códigos internada: listas iguais viram o mesmo objeto."""
+    t = tuple(valores)
+    compartilhada = _TUPLAS.get(t)
+    if compartilhada is None:
+        compartilhada = _TUPLAS[t] = tuple(sys.intern(v) for v in t)
+    return compartilhada
+
+
+def _horarios_dict(horarios: tuple[str, ...]) -> dict:
+    """{dia: horario} compartilhado por todas as turmas com a mesma grade (somente leitura)."""
+    d = _HORARIOS.get(horarios)
+    if d is None:
+        d = _HORARIOS[horarios] = dict(zip(DIAS, horarios))
+    return d
+
+
+def _converter(valor):
+    """JSON -> modelo: strings internadas, listas como tuplas compartilhadas."""
+    tipo = type(valor)
+    if tipo is str:
+        return sys.intern(valor)
+    if tipo is list:
+        return tupla(valor) if all(type(v) is str for v in valor) else tuple(valor)
+    if tipo is dict:
+        return {sys.intern(k): _converter(v) for k, v in valor.items()}
+    return valor
+
+
+def _texto(valor):
+    return sys.intern(valor) if type(valor) is str else _converter(valor)
+
+
+def _lista(valor):
+    """Lista de códigos -> tupla compartilhada (atalho para as já vistas)."""
+    if type(valor) is not list:
+        return _converter(valor)
+    try:
+        compartilhada = _TUPLAS.get(tuple(valor))
+    except TypeError:  # elementos não-hasheáveis
+        compartilhada = None
+    return compartilhada if compartilhada is not None else _converter(valor)
+
+
+_CHAVES_CURSO = ("periodo", "tipo", "prerequisitos", "corequisitos")
+_DADOS_CURSO: dict[tuple, dict] = {}
+
+
+def _por_curso(valor):
+    """por_curso com os dados de cada curso compartilhados entre turmas (somente leitura)."""
+    if type(valor) is not dict:
+        return _converter(valor)
+    saida = {}
+    for curso, dados in valor.items():
+        if type(dados) is dict and tuple(dados) == _CHAVES_CURSO:
+            pre, co = dados["prerequisitos"], dados["corequisitos"]
+            try:
+                chave = (dados["periodo"], dados["tipo"], tuple(pre), tuple(co)) if type(pre) is type(co) is list else None
+                compartilhado = _DADOS_CURSO.get(chave) if chave is not None else None
+            except TypeError:  # valores não-hasheáveis
+                chave = compartilhado = None
+            if compartilhado is None:
+                compartilhado = _converter(dados)
+                if chave is not None:
+                    _DADOS_CURSO[chave] = compartilhado
+        else:
+            compartilhado = _converter(dados)
+        saida[sys.intern(curso)] = compartilhado
+    return saida
+
+
+_horarios_get = itemgetter(*DIAS)
+_HORARIOS_VAZIOS = ("",) * len(DIAS)
+
+
+def _horarios_tupla(h: dict | None) -> tuple[str, ...]:
+    if not h:
+        return _HORARIOS_VAZIOS
+    try:
+        valores = _horarios_get(h)
+    except KeyError:
+        valores = tuple(h.get(dia) for dia in DIAS)
+    if None in valores:
+        valores = tuple(v or "" for v in valores)
+    return tupla(valores)
+
+
+@dataclass(slots=True)
+class Disciplina:
+    """Disciplina de uma matriz curricular."""
+
+    codigo: str
+    nome: str = ""
+    periodo: int | None = None
+    tipo: str = "optativa"
+    prerequisitos: tuple[str, ...] = ()
+    corequisitos: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Disciplina":
+        return cls(
+            codigo=sys.intern(d["codigo"]),
+            nome=sys.intern(d.get("nome") or ""),
+            periodo=d.get("periodo"),
+            tipo=sys.intern(d.get("tipo") or "optativa"),
+            prerequisitos=tupla(d.get("prerequisitos") or ()),
+            corequisitos=tupla(d.get("corequisitos") or ()),
+        )
+
+    def dados_curso(self) -> dict:
+        """Campos que a disciplina empresta a uma turma (periodo, tipo, pré/co-requisitos)."""
+        return {
+            "periodo": self.periodo,
+            "tipo": self.tipo,
+            "prerequisitos": self.prerequisitos,
+            "corequisitos": self.corequisitos,
+        }
+
+    def to_dict(self) -> dict:
+        return {"codigo": self.codigo, "nome": self.nome, **self.dados_curso()}
+
+
+@dataclass(slots=True)
+class Turma:
+    """Uma turma do quadro de horários (uma linha de db_disciplinas.json).
+
+    Campos preenchidos por etapas posteriores começam como AUSENTE e só são
+    serializados depois de atribuídos. Chaves do JSON que o modelo não conhece
+    ficam em `extras` e voltam no to_dict, para nenhuma etapa apagá-las.
+    """
+
+    codigo: str
+    nome: str
+    turma: str
+    nome_exibicao: str = ""
+    ch: int | None = None
+    link: str = ""
+    horarios: tuple[str, ...] = _HORARIOS_VAZIOS
+    docente: str | None = AUSENTE
+    professor_id: str | None = AUSENTE
+    periodo: int | None = AUSENTE
+    tipo: str = AUSENTE
+    prerequisitos: tuple[str, ...] = AUSENTE
+    corequisitos: tuple[str, ...] = AUSENTE
+    cursos: tuple[str, ...] = AUSENTE
+    por_curso: dict = AUSENTE
+    extras: dict | None = None
+
+    OPCIONAIS = (
+        "docente", "professor_id", "periodo", "tipo", "prerequisitos",
+        "corequisitos", "cursos", "por_curso",
+    )
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Turma":
+        get = d.get
+        return cls(
+            sys.intern(d["codigo"]),
+            sys.intern(d["nome"]),
+            sys.intern(d["turma"]),
+            sys.intern(get("nome_exibicao") or ""),
+            get("ch"),
+            get("link") or "",
+            _horarios_tupla(get("horarios")),
+            _texto(get("docente", AUSENTE)),
+            _texto(get("professor_id", AUSENTE)),
+            get("periodo", AUSENTE),
+            _texto(get("tipo", AUSENTE)),
+            _lista(get("prerequisitos", AUSENTE)),
+            _lista(get("corequisitos", AUSENTE)),
+            _lista(get("cursos", AUSENTE)),
+            _por_curso(get("por_curso", AUSENTE)),
+            None if _CAMPOS_JSON.issuperset(d) else {k: v for k, v in d.items() if k not in _CAMPOS_JSON},
+        )
+
+    def to_dict(self) -> dict:
+        """Dict no contrato de db_disciplinas.json (tuplas serializam como listas)."""
+        d = {
+            "codigo": self.codigo,
+            "nome": self.nome,
+            "turma": self.turma,
+            "nome_exibicao": self.nome_exibicao,
+            "ch": self.ch,
+            "link": self.link,
+            "horarios": _horarios_dict(self.horarios),
+        }
+        for campo, valor in zip(self.OPCIONAIS, _opcionais(self)):
+            if valor is not AUSENTE:
+                d[campo] = valor
+        if self.extras:
+            d.update(self.extras)
+        return d
+
+    def aplicar_disciplina(self, disciplina: Disciplina | None):
+        """Copia periodo/tipo/pré/co-requisitos da matriz (ou os padrões, se None)."""
+        d = disciplina or Disciplina(self.codigo)
+        self.periodo = d.periodo
+        self.tipo = d.tipo
+        self.prerequisitos = d.prerequisitos
+        self.corequisitos = d.corequisitos
+
+
+_opcionais = attrgetter(*Turma.OPCIONAIS)
+_CAMPOS_JSON = frozenset(("codigo", "nome", "turma", "nome_exibicao", "ch", "link", "horarios", *Turma.OPCIONAIS))
+
+
+@contextmanager
+def _sem_gc():
+    """Pausa o GC cíclico: a carga cria centenas de milhares de objetos sem ciclos,
+    e cada coleta disparada no meio dela só percorre o que já foi criado."""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def carregar_turmas(path) -> list[Turma]:
+    with pathlib.Path(path).open(encoding="utf-8") as f, _sem_gc():
+        return [Turma.from_dict(d) for d in json.load(f)]
+
+
+# ── Serialização (mesmo formato de json.dump(indent=2, ensure_ascii=False)) ──
+
+_INDENT = "  "
+_JSON_COMPARTILHADO: dict[tuple, str] = {}  # tupla/grade compartilhada -> JSON no nível 2
+
+
+def _valor_json(v, nivel: int) -> str:
+    """Um valor JSON cujas linhas internas ficam indentadas a partir de `nivel`."""
+    tipo = type(v)
+    if tipo is str:
+        return _str_json(v)
+    if v is None:
+        return "null"
+    if v is True:
+        return "true"
+    if v is False:
+        return "false"
+    if tipo is int:
+        return int.__repr__(v)
+    if tipo is tuple or tipo is list:
+        if not v:
+            return "[]"
+        sep = "\n" + _INDENT * (nivel + 1)
+        return "[" + sep + ("," + sep).join([_valor_json(x, nivel + 1) for x in v]) + "\n" + _INDENT * nivel + "]"
+    if tipo is dict and all(type(k) is str for k in v):
+        if not v:
+            return "{}"
+        sep = "\n" + _INDENT * (nivel + 1)
+        itens = [_str_json(k) + ": " + _valor_json(x, nivel + 1) for k, x in v.items()]
+        return "{" + sep + ("," + sep).join(itens) + "\n" + _INDENT * nivel + "}"
+    # float, subclasses e chaves não-string: delega ao json e reindenta
+    texto = json.dumps(v, ensure_ascii=False, indent=2)
+    return texto.replace("\n", "\n" + _INDENT * nivel)
+
+
+def _compartilhado_json(v) -> str:
+    """JSON de uma tupla internada (pré-requisitos, cursos), calculado uma vez por tupla."""
+    try:
+        texto = _JSON_COMPARTILHADO.get(v)
+    except TypeError:  # tupla com dicts/listas dentro (extras): não compartilhada
+        return _valor_json(v, 2)
+    if texto is None:
+        texto = _JSON_COMPARTILHADO[v] = _valor_json(v, 2)
+    return texto
+
+
+def _horarios_json(horarios: tuple[str, ...]) -> str:
+    chave = ("horarios", horarios)
+    texto = _JSON_COMPARTILHADO.get(chave)
+    if texto is None:
+        texto = _JSON_COMPARTILHADO[chave] = _valor_json(_horarios_dict(horarios), 2)
+    return texto
+
+
+_PREFIXOS_OPCIONAIS = tuple(f',\n    "{campo}": ' for campo in Turma.OPCIONAIS)
+
+
+def _turma_json(t: Turma) -> str:
+    partes = [
+        '{\n    "codigo": ', _str_json(t.codigo),
+        ',\n    "nome": ', _str_json(t.nome),
+        ',\n    "turma": ', _str_json(t.turma),
+        ',\n    "nome_exibicao": ', _str_json(t.nome_exibicao),
+        ',\n    "ch": ', _valor_json(t.ch, 2),
+        ',\n    "link": ', _str_json(t.link),
+        ',\n    "horarios": ', _horarios_json(t.horarios),
+    ]
+    for prefixo, valor in zip(_PREFIXOS_OPCIONAIS, _opcionais(t)):
+        if valor is AUSENTE:
+            continue
+        partes.append(prefixo)
+        if type(valor) is tuple:
+            partes.append(_compartilhado_json(valor))
+        else:
+            partes.append(_valor_json(valor, 2))
+    if t.extras:
+        for k, v in t.extras.items():
+            partes.append(",\n    " + _str_json(k) + ": ")
+            partes.append(_valor_json(v, 2))
+    partes.append("\n  }")
+    return "".join(partes)
+
+
+def salvar_turmas(turmas: list[Turma], path):
+    with pathlib.Path(path).open("w", encoding="utf-8") as f:
+        if not turmas:
+            f.write("[]")
+            return
+        f.write("[\n  ")
+        f.write(",\n  ".join([_turma_json(t) for t in turmas]))
+        f.write("\n]")
+
+
+def carregar_matriz(path) -> tuple[dict, list[Disciplina]]:
+    """Lê uma matriz_curricular.json: (metadados, disciplinas)."""
+    with pathlib.Path(path).open(encoding="utf-8") as f:
+        matriz = json.load(f)
+    # Novo schema: objeto com chave "disciplinas" (o antigo era uma lista)
+    if not isinstance(matriz, dict):
+        matriz = {"disciplinas": matriz}
+    metadados = {k: v for k, v in matriz.items() if k != "disciplinas"}
+    return metadados, [Disciplina.from_dict(d) for d in matriz["disciplinas"]]
@@ -4,16 +4,23 @@ seguindo o contrato de dados definido em CLAUDE.md.
 """
 
 import csv
-import json
 import pathlib
+import re
+
+from modelos import DIAS, Turma, salvar_turmas
 
 ROOT = pathlib.Path(__file__).parent.parent
-DIAS = ["seg", "ter", "qua", "qui", "sex", "sab"]
 
 
-def parse_row(row: dict) -> dict:
+def parse_cursos(valor: str) -> list[str]:
+    """'GEOGRAFIA, CIÊNCIAS ECONÔMICAS (2)' -> ['GEOGRAFIA', 'CIÊNCIAS ECONÔMICAS']."""
+    valor = re.sub(r"\s*\(\d+\)\s*$", "", valor.strip())
+    return [c.strip() for c in valor.split(",") if c.strip()]
+
+
+def parse_row(row: dict) -> Turma:
     horarios = {dia: row[col].strip() for dia, col in zip(DIAS, ["Seg", "Ter", "Qua", "Qui", "Sex", "Sab"])}
-    return {
+    return Turma.from_dict({
         "codigo": row["Código"].strip(),
         "nome": row["Nome"].strip(),
         "turma": row["Turma"].strip(),
@@ -21,7 +28,8 @@ def parse_row(row: dict) -> dict:
         "ch": None,
         "link": row.get("Link para disciplina", "").strip(),
         "horarios": horarios,
-    }
+        "cursos": parse_cursos(row.get("Cursos") or ""),
+    })
 
 
 def run(csv_path=None, out_path=None):
@@ -47,8 +55,7 @@ def run(csv_path=None, out_path=None):
                 continue
             materias.append(parse_row(row))
 
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(materias, f, ensure_ascii=False, indent=2)
+    salvar_turmas(materias, out_path)
 
     print(f"OK — {len(materias)} matérias escritas em {out_path}")
 
@@ -6,15 +6,32 @@ Gera docs/matriz_curricular/matriz_curricular.json com:
   - Metadados do currículo (faculdade, cargas horárias, nº currículo)
   - Lista de disciplinas com codigo, nome, periodo, tipo,
     prerequisitos e corequisitos
+
+Com --paginas-por-parte N, o PDF é dividido em trechos de N páginas enviados
+em paralelo; cada resposta é validada e só os trechos que falharem são
+reenviados. O tempo total passa a acompanhar o trecho mais lento. Cada trecho
+leva junto a última página do anterior, para não perder o cabeçalho de período
+nem linhas quebradas entre páginas; disciplinas repetidas ficam com a cópia
+mais completa. Um trecho cortado em max_tokens não é reenviado igual (o corte
+se repetiria): é dividido ao meio ou, se já tem uma página só, vai com o
+dobro de max_tokens.
+
+Uso:
+    python scraper/parse_matriz.py [--paginas-por-parte 2] [--workers 4]
 """
 
+import argparse
 import base64
+import io
 import json
 import os
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 ROOT = pathlib.Path(__file__).parent.parent
+DEFAULT_PDF = ROOT / "docs" / "matriz_curricular" / "MatrizCurricular2026_1771898812687.pdf"
+DEFAULT_JSON = ROOT / "docs" / "matriz_curricular" / "matriz_curricular.json"
 
 SYSTEM_PROMPT = """\
 Você é um extrator preciso de dados de matrizes curriculares universitárias.
@@ -53,12 +70,30 @@ Regras:
 - Saída MINIFICADA: sem espaços após ":" e ",", sem newlines
 """
 
+MODEL = "claude-haiku-4-5-20251001"
+MAX_TOKENS = 64000
+MAX_TOKENS_PARTE = 16000
+MAX_TENTATIVAS = 3
+METADADOS = ("nome_faculdade", "numero_curriculo", "horas_obrigatorias", "carga_horaria_total")
+
 USER_PROMPT = """\
 Extraia TODOS os dados desta matriz curricular, incluindo os metadados do curso \
 (nome da faculdade, número do currículo, cargas horárias) e TODAS as disciplinas.
 Retorne SOMENTE o objeto JSON minificado (uma única linha), sem nenhum texto adicional.
 """
 
+USER_PROMPT_PARTE = """\
+Este documento contém as páginas {primeira} a {fim} (de {total}) de uma matriz curricular.
+{contexto}Extraia TODAS as disciplinas presentes nestas páginas, no mesmo schema. \
+Metadados do curso que não aparecerem nestas páginas devem ser null.
+Retorne SOMENTE o objeto JSON minificado (uma única linha), sem nenhum texto adicional.
+"""
+
+CONTEXTO_PARTE = """\
+A página {primeira} repete o fim do trecho anterior: use-a para saber o período em vigor \
+(cabeçalhos "Nº período") e para completar linhas que continuam na página seguinte.
+"""
+
 
 def _strip_markdown_fence(text: str) -> str:
     """Remove code fences que o modelo pode adicionar mesmo sendo instruído a não."""
@@ -70,49 +105,20 @@ def _strip_markdown_fence(text: str) -> str:
     return text.strip()
 
 
-def run():
-    pdf_path = (
-        ROOT
-        / "docs"
-        / "matriz_curricular"
-        / "MatrizCurricular2026_1771898812687.pdf"
-    )
-    out_path = ROOT / "docs" / "matriz_curricular" / "matriz_curricular.json"
-
-    # Carrega variáveis de ambiente do .env (se existir)
-    env_file = ROOT / ".env"
-    if env_file.exists():
-        try:
-            from dotenv import load_dotenv
-            load_dotenv(env_file)
-        except ImportError:
-            pass  # python-dotenv opcional; a variável pode já estar no ambiente
-
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
-    if not api_key:
-        print("ERRO: ANTHROPIC_API_KEY não definida. Adicione ao .env ou exporte no shell.")
-        sys.exit(1)
-
-    try:
-        import anthropic
-    except ImportError:
-        print("ERRO: pacote 'anthropic' não instalado. Rode: pip install anthropic")
-        sys.exit(1)
+class ExtracaoInvalida(Exception):
+    """Resposta do modelo truncada, fora do schema ou não-JSON."""
 
-    if not pdf_path.exists():
-        print(f"ERRO: PDF não encontrado: {pdf_path}")
-        sys.exit(1)
 
-    print(f"  Lendo {pdf_path.name}...")
-    pdf_b64 = base64.standard_b64encode(pdf_path.read_bytes()).decode("utf-8")
+class RespostaTruncada(ExtracaoInvalida):
+    """O modelo parou em max_tokens: reenviar o mesmo pedido cortaria no mesmo ponto."""
 
-    print("  Enviando para Claude Haiku 4.5...")
-    client = anthropic.Anthropic(api_key=api_key)
 
+def _extrair(client, pdf_b64: str, prompt: str, max_tokens: int) -> dict:
+    """Envia um PDF (base64) ao modelo via streaming e devolve o JSON validado."""
     raw_parts: list[str] = []
     with client.messages.stream(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=64000,
+        model=MODEL,
+        max_tokens=max_tokens,
         system=SYSTEM_PROMPT,
         messages=[
             {
@@ -128,7 +134,7 @@ def run():
                     },
                     {
                         "type": "text",
-                        "text": USER_PROMPT,
+                        "text": prompt,
                     },
                 ],
             }
@@ -136,28 +142,214 @@ def run():
     ) as stream:
         for text in stream.text_stream:
             raw_parts.append(text)
+        final = getattr(stream, "get_final_message", None)
+        truncada = final is not None and final().stop_reason == "max_tokens"
 
+    if truncada:
+        raise RespostaTruncada(f"resposta cortada em max_tokens={max_tokens}")
     raw = _strip_markdown_fence("".join(raw_parts))
 
     try:
-        result: dict = json.loads(raw)
+        result = json.loads(raw)
     except json.JSONDecodeError as e:
-        print(f"ERRO: resposta do Claude não é JSON válido: {e}")
-        print("Primeiros 500 chars da resposta:")
-        print(raw[:500])
-        sys.exit(1)
+        raise ExtracaoInvalida(f"resposta não é JSON válido: {e} — início: {raw[:500]!r}") from e
+
+    if not isinstance(result, dict) or not isinstance(result.get("disciplinas"), list):
+        raise ExtracaoInvalida("resposta sem lista 'disciplinas'")
+    if not all(isinstance(d, dict) and d.get("codigo") for d in result["disciplinas"]):
+        raise ExtracaoInvalida("disciplina sem 'codigo' na resposta")
+    return result
+
+
+def _faixas(total: int, paginas_por_parte: int) -> list[tuple[int, int, int]]:
+    """Divide as páginas em trechos de N, cada um com a última página do anterior.
+
+    Retorna [(primeira_pagina, pagina_inicial, pagina_final)], contando de 1; a
+    primeira página só difere da inicial quando há sobreposição.
+    """
+    return [
+        (max(1, inicio), inicio + 1, min(total, inicio + paginas_por_parte))
+        for inicio in range(0, total, paginas_por_parte)
+    ]
+
+
+def _recortar_pdf(reader, primeira: int, fim: int) -> str:
+    """PDF (base64) só com as páginas primeira..fim."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for i in range(primeira - 1, fim):
+        writer.add_page(reader.pages[i])
+    buf = io.BytesIO()
+    writer.write(buf)
+    return base64.standard_b64encode(buf.getvalue()).decode("utf-8")
+
+
+def _reduzir(trecho: tuple[int, int, int, int]) -> list[tuple[int, int, int, int]] | None:
+    """Pedido menor para um trecho cortado em max_tokens, ou None se não há como reduzir.
+
+    Com mais de uma página própria, divide ao meio (a segunda metade leva a
+    última página da primeira, como os demais trechos); com uma só, dobra
+    max_tokens até MAX_TOKENS.
+    """
+    primeira, inicio, fim, max_tokens = trecho
+    if fim > inicio:
+        meio = (inicio + fim) // 2
+        return [(primeira, inicio, meio, max_tokens), (meio, meio + 1, fim, max_tokens)]
+    if max_tokens < MAX_TOKENS:
+        return [(primeira, inicio, fim, min(MAX_TOKENS, max_tokens * 2))]
+    return None
+
+
+def _prompt_parte(primeira: int, inicio: int, fim: int, total: int) -> str:
+    contexto = CONTEXTO_PARTE.format(primeira=primeira) if primeira < inicio else ""
+    return USER_PROMPT_PARTE.format(primeira=primeira, fim=fim, total=total, contexto=contexto)
 
-    disciplinas: list[dict] = result.get("disciplinas", [])
 
-    # Deduplica por código (mantém primeira ocorrência)
-    seen: set[str] = set()
-    unique = []
+def _extrair_em_partes(client, pdf_bytes: bytes, paginas_por_parte: int, workers: int) -> dict:
+    """Extrai os trechos em paralelo, reenviando só os que falharem, e junta o resultado.
+
+    Cada trecho tem até MAX_TENTATIVAS; dividir um trecho truncado (ou dobrar
+    seu max_tokens) não gasta tentativa, porque o pedido muda.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    total = len(reader.pages)
+    faixas = _faixas(total, paginas_por_parte)
+    print(f"  {total} páginas divididas em {len(faixas)} trechos ({workers} em paralelo)...")
+
+    resultados: dict[int, dict] = {}  # página inicial → resposta
+    pendentes = [((*faixa, MAX_TOKENS_PARTE), 1) for faixa in faixas]
+    desistidos: list[tuple[int, int, int, int]] = []
+    while pendentes:
+        proximos = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_trecho = {}
+            for trecho, tentativa in pendentes:
+                primeira, inicio, fim, max_tokens = trecho
+                prompt = _prompt_parte(primeira, inicio, fim, total)
+                pdf_b64 = _recortar_pdf(reader, primeira, fim)
+                future = executor.submit(_extrair, client, pdf_b64, prompt, max_tokens)
+                future_to_trecho[future] = (trecho, tentativa)
+
+            for future in as_completed(future_to_trecho):
+                trecho, tentativa = future_to_trecho[future]
+                _, inicio, fim, _ = trecho
+                try:
+                    resultados[inicio] = future.result()
+                except RespostaTruncada as exc:
+                    menores = _reduzir(trecho)
+                    if menores:
+                        novos = ", ".join(f"{t[1]}-{t[2]} ({t[3]} tokens)" for t in menores)
+                        print(f"    [!] páginas {inicio}-{fim}: {exc}; reenviando como {novos}")
+                        proximos.extend((t, tentativa) for t in menores)
+                        continue
+                    erro = exc
+                except Exception as exc:
+                    erro = exc
+                else:
+                    n = len(resultados[inicio]["disciplinas"])
+                    print(f"    [OK] páginas {inicio}-{fim}: {n} disciplinas")
+                    continue
+
+                print(f"    [!] páginas {inicio}-{fim} falharam (tentativa {tentativa}): {erro}")
+                if tentativa < MAX_TENTATIVAS:
+                    proximos.append((trecho, tentativa + 1))
+                else:
+                    desistidos.append(trecho)
+        pendentes = sorted(proximos)
+
+    if desistidos:
+        paginas = ", ".join(f"{t[1]}-{t[2]}" for t in sorted(desistidos))
+        raise ExtracaoInvalida(f"trechos sem resposta válida após {MAX_TENTATIVAS} tentativas: {paginas}")
+
+    # Junta na ordem das páginas; metadados vêm do primeiro trecho que os trouxer
+    result: dict = {campo: None for campo in METADADOS}
+    result["disciplinas"] = []
+    for inicio in sorted(resultados):
+        parcial = resultados[inicio]
+        for campo in METADADOS:
+            if result[campo] is None and parcial.get(campo) is not None:
+                result[campo] = parcial[campo]
+        result["disciplinas"].extend(parcial["disciplinas"])
+    return result
+
+
+def _completude(d: dict) -> tuple:
+    """Quanto uma cópia da disciplina trouxe: período, pré/co-requisitos e nome."""
+    requisitos = len(d.get("prerequisitos") or []) + len(d.get("corequisitos") or [])
+    return (d.get("periodo") is not None, requisitos, len(d.get("nome") or ""))
+
+
+def deduplicar(disciplinas: list[dict]) -> list[dict]:
+    """Uma disciplina por código, na ordem em que aparecem, ficando com a cópia mais completa.
+
+    Linhas quebradas entre páginas chegam em dois trechos: uma cópia pode vir
+    sem período ou com parte dos pré-requisitos.
+    """
+    melhores: dict[str, dict] = {}
     for d in disciplinas:
         codigo = d.get("codigo", "")
-        if codigo and codigo not in seen:
-            seen.add(codigo)
-            unique.append(d)
+        if codigo and (codigo not in melhores or _completude(d) > _completude(melhores[codigo])):
+            melhores[codigo] = d
+    return list(melhores.values())
+
+
+def _cliente_anthropic():
+    # Carrega variáveis de ambiente do .env (se existir)
+    env_file = ROOT / ".env"
+    if env_file.exists():
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(env_file)
+        except ImportError:
+            pass  # python-dotenv opcional; a variável pode já estar no ambiente
+
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise RuntimeError("ANTHROPIC_API_KEY não definida. Adicione ao .env ou exporte no shell.")
+
+    try:
+        import anthropic
+    except ImportError as e:
+        raise RuntimeError("pacote 'anthropic' não instalado. Rode: pip install anthropic") from e
+
+    # ANTHROPIC_BASE_URL (lido pelo SDK) permite apontar para um servidor local de testes
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def run(paginas_por_parte=None, workers=4, client=None, pdf_path=None, out_path=None):
+    """Extrai a matriz do PDF. `client` permite injetar um stub da API de mensagens.
 
+    Levanta ExtracaoInvalida, RuntimeError (chave/pacote ausente) ou
+    FileNotFoundError em vez de encerrar o processo.
+    """
+    pdf_path = DEFAULT_PDF if pdf_path is None else pathlib.Path(pdf_path)
+    out_path = DEFAULT_JSON if out_path is None else pathlib.Path(out_path)
+
+    if client is None:
+        client = _cliente_anthropic()
+
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF não encontrado: {pdf_path}")
+
+    print(f"  Lendo {pdf_path.name}...")
+    pdf_bytes = pdf_path.read_bytes()
+
+    if paginas_por_parte:
+        try:
+            import pypdf  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("pacote 'pypdf' não instalado. Rode: pip install pypdf") from e
+        print(f"  Enviando para Claude Haiku 4.5 em trechos de {paginas_por_parte} página(s)...")
+        result = _extrair_em_partes(client, pdf_bytes, paginas_por_parte, workers)
+    else:
+        print("  Enviando para Claude Haiku 4.5...")
+        pdf_b64 = base64.standard_b64encode(pdf_bytes).decode("utf-8")
+        result = _extrair(client, pdf_b64, USER_PROMPT, MAX_TOKENS)
+
+    unique = deduplicar(result.get("disciplinas", []))
     result["disciplinas"] = unique
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -176,7 +368,17 @@ def run():
 
 
 def main():
-    run()
+    parser = argparse.ArgumentParser(description="Extrai a matriz curricular (PDF) para JSON.")
+    parser.add_argument("--paginas-por-parte", type=int, default=None,
+                        help="divide o PDF em trechos de N páginas enviados em paralelo")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="trechos enviados simultaneamente (padrão: 4)")
+    args = parser.parse_args()
+    try:
+        run(paginas_por_parte=args.paginas_por_parte, workers=args.workers)
+    except (ExtracaoInvalida, RuntimeError, FileNotFoundError) as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,307 @@
+"""
+resolve_professores.py — resolução de entidades de professores.
+
+Unifica as grafias de um mesmo docente vindas da listagem do quadro de horários
+(tooltip, ex: "LUIS"), das páginas individuais das turmas (`docente` completo)
+e de web/data/nomes_professores.json (`nome_exibicao` e `apelido` curados).
+
+Cada professor recebe um id estável (uuid5 do nome canônico normalizado),
+gravado em `professor_id` nas matérias e em `id` no nomes_professores.json.
+Um `id` já gravado no nomes_professores.json é sempre reaproveitado, mesmo que
+a grafia canônica mude depois.
+
+O casamento aproximado usa índices invertidos por token e por trigrama
+(blocking): cada nome só é comparado com os candidatos que compartilham
+alguma chave, nunca todos contra todos.
+"""
+
+import json
+import pathlib
+import re
+import unicodedata
+import uuid
+from collections import Counter, defaultdict
+
+from modelos import carregar_turmas, salvar_turmas
+
+ROOT = pathlib.Path(__file__).parent.parent
+DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
+NOMES_JSON = ROOT / "web" / "data" / "nomes_professores.json"
+
+PROFESSOR_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://app.uff.br/graduacao/professores")
+SEM_PROFESSOR = "Sem professor alocado"
+PARTICULAS = {"da", "de", "do", "das", "dos", "e"}
+
+LIMIAR_NOME_COMPLETO = 0.85  # Jaccard de trigramas para fundir duas grafias completas
+LIMIAR_MENCAO = 0.6          # pontuação mínima para resolver uma menção curta
+MIN_TRIGRAMAS = 3            # trigramas em comum para virar candidato
+MAX_BLOCO = 500              # chaves mais frequentes que isso não geram candidatos
+
+
+def normalizar(nome: str) -> str:
+    """Remove acentos, pontuação e caixa: 'José  da SILVA' -> 'jose da silva'."""
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^a-z ]", " ", sem_acento.lower()).split())
+
+
+def tokens(nome: str) -> tuple[str, ...]:
+    """Tokens significativos do nome (sem partículas como 'da', 'de')."""
+    return tuple(t for t in normalizar(nome).split() if t not in PARTICULAS)
+
+
+def trigramas(toks: tuple[str, ...]) -> set[str]:
+    texto = f"  {' '.join(toks)} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def professor_id(nome: str) -> str:
+    """Id estável de um professor a partir do seu nome canônico."""
+    return str(uuid.uuid5(PROFESSOR_NAMESPACE, " ".join(tokens(nome))))
+
+
+def formatar_nome_exibicao(docente: str) -> str:
+    """Primeiro e último nome capitalizados (padrão quando não há curadoria)."""
+    partes_nome = docente.split()
+    if len(partes_nome) > 1:
+        return f"{partes_nome[0].capitalize()} {partes_nome[-1].capitalize()}"
+    if len(partes_nome) == 1:
+        return partes_nome[0].capitalize()
+    return ""
+
+
+def _acentos(nome: str) -> int:
+    return sum(1 for c in nome if not c.isascii())
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _pontuar_mencao(toks: tuple[str, ...], alias: tuple[str, ...]) -> float:
+    """Pontua uma menção curta contra um nome conhecido.
+
+    'LUIS' ou 'Luis Silva' são compatíveis com 'Luis Paulo Batista da Silva':
+    mesmo primeiro nome e demais tokens contidos no nome completo.
+    """
+    if not toks or not alias or toks[0] != alias[0]:
+        return 0.0
+    if not set(toks) <= set(alias):
+        return 0.0
+    return 0.9 if len(toks) > 1 else LIMIAR_MENCAO
+
+
+class IndiceProfessores:
+    """Registro de professores com índices de token e trigrama para blocking."""
+
+    def __init__(self):
+        self.canonicos: list[str] = []
+        self.exibicao: list[str | None] = []
+        self.apelidos: list[str | None] = []
+        self.ids: list[str | None] = []
+        self._aliases: list[list[tuple[str, ...]]] = []
+        self._trigramas: dict[tuple[str, ...], set[str]] = {}
+        self._exato: dict[tuple[str, ...], int] = {}
+        self._por_token: dict[str, set[int]] = defaultdict(set)
+        self._por_trigrama: dict[str, set[int]] = defaultdict(set)
+
+    def __len__(self):
+        return len(self.canonicos)
+
+    def _indexar(self, eid: int, toks: tuple[str, ...]):
+        if toks in self._exato:
+            return
+        self._exato[toks] = eid
+        self._aliases[eid].append(toks)
+        tris = trigramas(toks)
+        self._trigramas[toks] = tris
+        for t in toks:
+            self._por_token[t].add(eid)
+        for g in tris:
+            self._por_trigrama[g].add(eid)
+
+    def _candidatos(self, toks: tuple[str, ...], tris: set[str]) -> set[int]:
+        candidatos: set[int] = set()
+        for t in toks:
+            bloco = self._por_token.get(t)
+            if bloco and len(bloco) <= MAX_BLOCO:
+                candidatos |= bloco
+        contagem: Counter = Counter()
+        for g in tris:
+            bloco = self._por_trigrama.get(g)
+            if bloco and len(bloco) <= MAX_BLOCO:
+                contagem.update(bloco)
+        candidatos.update(eid for eid, n in contagem.items() if n >= MIN_TRIGRAMAS)
+        return candidatos
+
+    def adicionar(self, nome_completo: str) -> int | None:
+        """Registra um nome completo, fundindo-o a uma entidade existente se for a mesma pessoa."""
+        toks = tokens(nome_completo)
+        if not toks:
+            return None
+        if toks in self._exato:
+            return self._exato[toks]
+
+        tris = trigramas(toks)
+        melhor, melhor_score = None, 0.0
+        for eid in self._candidatos(toks, tris):
+            score = max(_jaccard(tris, self._trigramas[a]) for a in self._aliases[eid])
+            if score > melhor_score:
+                melhor, melhor_score = eid, score
+
+        if melhor is None or melhor_score < LIMIAR_NOME_COMPLETO:
+            melhor = len(self.canonicos)
+            self.canonicos.append(nome_completo)
+            self.exibicao.append(None)
+            self.apelidos.append(None)
+            self.ids.append(None)
+            self._aliases.append([])
+        self._indexar(melhor, toks)
+        return melhor
+
+    def adicionar_alias(self, eid: int, nome: str | None):
+        """Associa diretamente uma grafia curada (nome_exibicao, apelido) a uma entidade."""
+        toks = tokens(nome or "")
+        if toks:
+            self._indexar(eid, toks)
+
+    def resolver(self, nome: str) -> int | None:
+        """Resolve uma menção (completa ou curta) para uma entidade; None se ausente ou ambígua."""
+        toks = tokens(nome)
+        if not toks:
+            return None
+        if toks in self._exato:
+            return self._exato[toks]
+
+        tris = trigramas(toks)
+        scores: dict[int, float] = {}
+        for eid in self._candidatos(toks, tris):
+            scores[eid] = max(
+                max(_pontuar_mencao(toks, a), _jaccard(tris, self._trigramas[a]))
+                for a in self._aliases[eid]
+            )
+        if not scores:
+            return None
+        ordenados = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        eid, score = ordenados[0]
+        if score < LIMIAR_MENCAO:
+            return None
+        if len(ordenados) > 1 and ordenados[1][1] == score:
+            return None  # ex: "ANDRE" com vários Andrés no departamento
+        return eid
+
+    def nome_exibicao(self, eid: int) -> str:
+        return self.exibicao[eid] or formatar_nome_exibicao(self.canonicos[eid])
+
+    def professor_id(self, eid: int) -> str:
+        return self.ids[eid] or professor_id(self.canonicos[eid])
+
+
+def _nome_valido(nome: str | None) -> bool:
+    return bool(nome and nome.strip() and nome.strip() != SEM_PROFESSOR)
+
+
+def run(json_path=None, nomes_path=None):
+    """Canonicaliza os docentes de db_disciplinas.json e atualiza nomes_professores.json."""
+    json_path = DEFAULT_JSON if json_path is None else pathlib.Path(json_path)
+    nomes_path = NOMES_JSON if nomes_path is None else pathlib.Path(nomes_path)
+
+    materias = carregar_turmas(json_path)
+
+    curados: list[dict] = []
+    if nomes_path.exists():
+        with nomes_path.open(encoding="utf-8") as f:
+            curados = json.load(f)
+
+    # Nomes completos primeiro, do mais longo ao mais curto: a grafia mais
+    # completa de cada pessoa vira o nome canônico da entidade. Entre grafias
+    # que só diferem em acento/caixa, vence a curada, depois a acentuada e
+    # a que não está toda em maiúsculas — nunca a ordem de iteração do set.
+    nomes_curados = {e["docente"] for e in curados if _nome_valido(e.get("docente"))}
+    completos = nomes_curados | {m.docente for m in materias if _nome_valido(m.docente)}
+    indice = IndiceProfessores()
+    ordem = sorted(
+        completos,
+        key=lambda n: (-len(tokens(n)), normalizar(n), n not in nomes_curados, -_acentos(n), n.isupper(), n),
+    )
+    for nome in ordem:
+        indice.adicionar(nome)
+
+    for entry in curados:
+        if not _nome_valido(entry.get("docente")):
+            continue
+        eid = indice.resolver(entry["docente"])
+        if eid is None:
+            continue  # ex: docente só com pontuação
+        indice.ids[eid] = indice.ids[eid] or entry.get("id")
+        indice.exibicao[eid] = indice.exibicao[eid] or entry.get("nome_exibicao")
+        indice.apelidos[eid] = indice.apelidos[eid] or entry.get("apelido")
+        indice.adicionar_alias(eid, entry.get("nome_exibicao"))
+        indice.adicionar_alias(eid, entry.get("apelido"))
+
+    print(f"  [-] {len(completos)} grafias completas agrupadas em {len(indice)} professores.")
+
+    resolvidas = 0
+    sem_match = 0
+    usados: set[int] = set()
+    for m in materias:
+        if _nome_valido(m.docente):
+            eid = indice.resolver(m.docente)
+        elif _nome_valido(m.nome_exibicao):
+            eid = indice.resolver(m.nome_exibicao)
+        else:
+            continue
+
+        if eid is None:
+            sem_match += 1
+            continue
+        m.docente = indice.canonicos[eid]
+        m.nome_exibicao = indice.nome_exibicao(eid)
+        m.professor_id = indice.professor_id(eid)
+        usados.add(eid)
+        resolvidas += 1
+
+    # Mantém a ordem das entradas curadas e acrescenta os professores novos no fim
+    vistos: set[int] = set()
+    saida: list[dict] = []
+    for entry in curados:
+        if not _nome_valido(entry.get("docente")):
+            saida.append(entry)  # ex: "Sem professor alocado", sem id
+            continue
+        eid = indice.resolver(entry["docente"])
+        if eid is None:
+            saida.append(entry)
+            continue
+        if eid in vistos:
+            continue
+        vistos.add(eid)
+        saida.append(_entrada(indice, eid))
+    novos = sorted(usados - vistos, key=lambda eid: normalizar(indice.canonicos[eid]))
+    saida.extend(_entrada(indice, eid) for eid in novos)
+
+    salvar_turmas(materias, json_path)
+
+    nomes_path.parent.mkdir(parents=True, exist_ok=True)
+    with nomes_path.open("w", encoding="utf-8") as f:
+        json.dump(saida, f, ensure_ascii=False, indent=2)
+
+    print(f"  [OK] {resolvidas} turmas vinculadas a um professor ({sem_match} menções ambíguas/sem match).")
+    print(f"  [OK] {len(saida)} entradas em {nomes_path.name} ({len(novos)} professores novos).")
+
+    return materias
+
+
+def _entrada(indice: IndiceProfessores, eid: int) -> dict:
+    return {
+        "id": indice.professor_id(eid),
+        "docente": indice.canonicos[eid],
+        "nome_exibicao": indice.nome_exibicao(eid),
+        "apelido": indice.apelidos[eid],
+    }
+
+
+def main():
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,10 @@ Requer autenticação via login e utiliza sessões de Cookies injetadas.
 Otimizado através de multithreading (ThreadPoolExecutor) no módulo `requests` para saltar significativamente em performance.
 """
 
-import json
-import os
 import pathlib
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-from bs4 import BeautifulSoup
+from modelos import carregar_turmas, salvar_turmas
 
 ROOT = pathlib.Path(__file__).parent.parent
 DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
@@ -19,6 +16,8 @@ DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
 
 def _parse_page(html: str) -> dict:
     """Extrai a CH Total e o Docente da página individual de uma turma."""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     
     result = {"ch": None, "docente": None}
@@ -77,10 +76,9 @@ def run(json_path=None, cookies=None, **_kwargs):
         print(f"Erro: Arquivo não encontrado: {json_path}")
         return
 
-    with json_path.open(encoding="utf-8") as f:
-        materias = json.load(f)
+    materias = carregar_turmas(json_path)
 
-    links_unicos = list({m["link"] for m in materias if m.get("link")})
+    links_unicos = list({m.link for m in materias if m.link})
     total_links = len(links_unicos)
     print(f"  [-] Identificados {total_links} links unicos para consultar.")
 
@@ -92,6 +90,8 @@ def run(json_path=None, cookies=None, **_kwargs):
         print("  [!] Aviso: Nenhum cookie de sessão fornecido. Algumas páginas como 'Docentes' podem falhar ou retornar vazio sem SSO.")
 
     # Configure the requests session using the fast requests module with Playwright's shared cookies
+    import requests
+
     session = requests.Session()
     session.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -135,26 +135,16 @@ def run(json_path=None, cookies=None, **_kwargs):
 
     print("  [-] Atualizando base JSON com as novas métricas capturadas...")
     for m in materias:
-        link = m.get("link", "")
-        if link in data_map:
-            if data_map[link]["ch"] is not None:
-                m["ch"] = data_map[link]["ch"]
+        if m.link in data_map:
+            if data_map[m.link]["ch"] is not None:
+                m.ch = data_map[m.link]["ch"]
             
-            docente = data_map[link]["docente"]
+            # nome_exibicao é derivado depois, em resolve_professores.py
+            docente = data_map[m.link]["docente"]
             if docente is not None:
-                m["docente"] = docente
-                
-                # Formatar o nome do professor (Primeiro e Último Nome)
-                partes_nome = docente.split()
-                if len(partes_nome) > 1:
-                    primeiro_nome = partes_nome[0].capitalize()
-                    ultimo_nome = partes_nome[-1].capitalize()
-                    m["nome_exibicao"] = f"{primeiro_nome} {ultimo_nome}"
-                elif len(partes_nome) == 1:
-                    m["nome_exibicao"] = partes_nome[0].capitalize()
-
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(materias, f, ensure_ascii=False, indent=2)
+                m.docente = docente
+
+    salvar_turmas(materias, json_path)
 
     print(f"  [OK] Cargas Horárias capturadas (total ou revalidadas): {encontrados_ch}/{total_links}.")
     print(f"  [OK] Perfis Docentes únicos capturados/validados: {encontrados_doc}/{total_links}.")
@@ -1,23 +1,33 @@
 import os
 import time
 import csv
-import json
 import pathlib
 import re
-from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+import sys
 import parse_csv
+from modelos import carregar_turmas
 
 ROOT = pathlib.Path(__file__).parent.parent
 
+# Semestre e curso consultados no quadro de horários (também particionam os snapshots)
+ANOSEMESTRE = "20261"
+ID_CURSO = "4"
+# Nome do curso ID_CURSO como aparece em "Curso(s) com vagas" (chave da matriz principal em enrich_materias.py)
+NOME_CURSO = "CIÊNCIAS ECONÔMICAS"
+SEARCH_URL = (
+    "https://app.uff.br/graduacao/quadrodehorarios/?utf8=%E2%9C%93&q%5Bdisciplina_nome_or_disciplina_codigo_cont%5D=&"
+    f"q%5Banosemestre_eq%5D={ANOSEMESTRE}"
+    "&q%5Bdisciplina_cod_departamento_eq%5D=&button=&q%5Bidturno_eq%5D=&q%5Bpor_professor%5D=&q%5Bidlocalidade_eq%5D=1&"
+    f"q%5Bvagas_turma_curso_idcurso_eq%5D={ID_CURSO}"
+    "&q%5Bdisciplina_disciplinas_curriculos_idcurriculo_eq%5D=&q%5Bcurso_ferias_eq%5D=&q%5Bidturmamodalidade_eq%5D="
+)
+
 def _write_amostra_csv():
     """Gera docs/grade_horarios.csv a partir do JSON final, com CH_total e sem Modulo/Tipo."""
     json_path = ROOT / "web" / "data" / "db_disciplinas.json"
     out_path = ROOT / "docs" / "grade_horarios.csv"
 
-    with json_path.open(encoding="utf-8") as f:
-        materias = json.load(f)
+    materias = carregar_turmas(json_path)
 
     headers = ["Codigo", "Nome", "Turma", "Nome_exibicao", "CH_total",
                "Seg", "Ter", "Qua", "Qui", "Sex", "Sab", "Link"]
@@ -26,25 +36,24 @@ def _write_amostra_csv():
         writer = csv.writer(f, delimiter=";")
         writer.writerow(headers)
         for m in materias:
-            h = m.get("horarios", {})
             writer.writerow([
-                m.get("codigo", ""),
-                m.get("nome", ""),
-                m.get("turma", ""),
-                m.get("nome_exibicao", ""),
-                m.get("ch", ""),
-                h.get("seg", ""),
-                h.get("ter", ""),
-                h.get("qua", ""),
-                h.get("qui", ""),
-                h.get("sex", ""),
-                h.get("sab", ""),
-                m.get("link", ""),
+                m.codigo,
+                m.nome,
+                m.turma,
+                m.nome_exibicao,
+                "" if m.ch is None else m.ch,
+                *m.horarios,
+                m.link,
             ])
 
     print(f"  {len(materias)} linhas escritas em {out_path}")
 
 def main():
+    # Dependências pesadas só quando o scraping roda de fato (ver cli.py)
+    from bs4 import BeautifulSoup
+    from dotenv import load_dotenv
+    from playwright.sync_api import sync_playwright
+
     load_dotenv()
     CPF = os.environ.get("UFF_USER")
     SENHA = os.environ.get("UFF_PASSWORD")
@@ -53,7 +62,6 @@ def main():
         print("Erro: CPF ou SENHA não encontrados no .env")
         return
 
-    SEARCH_URL = "https://app.uff.br/graduacao/quadrodehorarios/?utf8=%E2%9C%93&q%5Bdisciplina_nome_or_disciplina_codigo_cont%5D=&q%5Banosemestre_eq%5D=20261&q%5Bdisciplina_cod_departamento_eq%5D=&button=&q%5Bidturno_eq%5D=&q%5Bpor_professor%5D=&q%5Bidlocalidade_eq%5D=1&q%5Bvagas_turma_curso_idcurso_eq%5D=4&q%5Bdisciplina_disciplinas_curriculos_idcurriculo_eq%5D=&q%5Bcurso_ferias_eq%5D=&q%5Bidturmamodalidade_eq%5D="
     
     os.makedirs("docs", exist_ok=True)
     csv_filename = "docs/turmas_uff_final.csv"
@@ -206,9 +214,17 @@ def main():
         print("\n[->] Buscando Carga Horaria (CH) e Docentes paralelizados...")
         scrape_ch.run(cookies=playwright_cookies)
 
+        import resolve_professores
+        print("\n[->] Unificando professores (listagem, turmas e nomes_professores.json)...")
+        resolve_professores.run()
+
         import parse_matriz
         print("\n[->] Parseando Matriz Curricular (PDF)...")
-        parse_matriz.run()
+        try:
+            parse_matriz.run()
+        except (parse_matriz.ExtracaoInvalida, RuntimeError, FileNotFoundError) as e:
+            print(f"ERRO: {e}")
+            sys.exit(1)
 
         import enrich_materias
         print("\n[->] Enriquecendo db_disciplinas.json com dados da matriz...")
@@ -216,6 +232,14 @@ def main():
 
         print("\n[OK] Gerando docs/grade_horarios.csv final para validação...")
         _write_amostra_csv()
+
+        import export_assets
+        print("\n[->] Publicando dados minificados, comprimidos e com hash em web/public/data...")
+        export_assets.run()
+
+        import snapshots
+        print(f"\n[->] Gravando snapshot do semestre {ANOSEMESTRE} (curso {ID_CURSO}) em docs/snapshots...")
+        snapshots.gravar(ANOSEMESTRE, ID_CURSO)
         print("Pipeline otimizado concluído com sucesso! [OK]")
 
 if __name__ == "__main__":
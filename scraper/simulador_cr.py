@@ -0,0 +1,375 @@
+"""
+simulador_cr.py — simulação vetorizada de CR (coeficiente de rendimento) com NumPy.
+
+Reproduz as regras de web/app/calculadora-cr/CalculadoraCR.tsx (exclusões,
+reprovações na pandemia, nota efetiva com VS) para o histórico e avalia de uma
+vez milhares de cenários de notas nas disciplinas planejadas, cuja carga
+horária vem de db_disciplinas.json. Para coortes inteiras, cada aluno é uma
+linha: o CR de todos os alunos em todos os cenários sai de um único produto
+de matrizes.
+
+Uso:
+    python scraper/simulador_cr.py historico.csv --planejadas SEN00067 SEN00076 --alvo 8
+
+Em lote (vários históricos ou um diretório de .csv; o aluno é o nome do arquivo):
+    python scraper/simulador_cr.py historicos/ --planejadas SEN00067 SEN00076 --alvo 8
+    python scraper/simulador_cr.py historicos/ --planos planos.csv --alvo 8 --saida coorte.csv
+
+planos.csv tem uma linha por aluno: `aluno;CODIGO1 CODIGO2 ...`.
+"""
+
+import argparse
+import csv
+import pathlib
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from modelos import carregar_turmas
+
+ROOT = pathlib.Path(__file__).parent.parent
+DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
+CH_PADRAO = 60  # mesma CH usada pela calculadora quando a disciplina não está no catálogo
+
+SITUACOES_EXCLUIDAS = (
+    "trancamento",
+    "trancado",
+    "atividade complementar",
+    "dispensa",
+    "monitoria",
+)
+PERCENTIS = (5, 25, 50, 75, 95)
+
+
+@dataclass(slots=True)
+class Historico:
+    """Soma ponderada (nota efetiva × horas) e horas que já entram no CR."""
+
+    numerador: float
+    horas: float
+
+    @property
+    def cr(self) -> float:
+        return self.numerador / self.horas if self.horas else 0.0
+
+
+def _parse_num(valor: str) -> float | None:
+    """Mesma regra de parseNum: troca a primeira vírgula e lê o prefixo numérico (parseFloat)."""
+    s = re.sub(r"[^0-9.\-]", "", (valor or "").replace(",", ".", 1))
+    m = re.match(r"-?(\d+\.?\d*|\.\d+)", s)
+    return float(m.group(0)) if m else None
+
+
+def _ano(semestre: str) -> int:
+    m = re.match(r"^(\d{4})\.[12]$", semestre) or re.search(r"\d+[°º]?/(\d{4})", semestre)
+    return int(m.group(1)) if m else 0
+
+
+def nota_efetiva(nota: float | None, vs: float | None, situacao: str) -> float:
+    """Mesma regra de calcularNotaEfetiva: VS aprovado substitui, VS reprovado faz média."""
+    efetiva = nota or 0.0
+    if vs is not None:
+        s = situacao.lower()
+        if ("aprovado" in s or "aproveitamento" in s) and vs > 6:
+            efetiva = vs
+        elif "reprovado" in s:
+            efetiva = (efetiva + vs) / 2
+    return efetiva
+
+
+def entra_no_cr(situacao: str, semestre: str) -> bool:
+    s = situacao.lower()
+    if any(k in s for k in SITUACOES_EXCLUIDAS):
+        return False
+    # Reprovações em 2020–2022 (pandemia) não contam
+    return not (2020 <= _ano(semestre) <= 2022 and "reprovado" in s)
+
+
+def carregar_historico(path) -> Historico:
+    """Lê o histórico (.csv, mesmo formato aceito pela calculadora) e acumula o CR.
+
+    Como na calculadora, só entram disciplinas com semestre: o CR é acumulado
+    semestre a semestre e as linhas sem semestre não pertencem a nenhum.
+    """
+    with pathlib.Path(path).open(encoding="utf-8-sig", newline="") as f:
+        amostra = f.read(4096)
+        f.seek(0)
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=";,\t")
+        linhas = list(csv.reader(f, dialeto))[1:]
+
+    numerador = 0.0
+    horas = 0.0
+    for row in linhas:
+        row = row + [""] * (10 - len(row))
+        if not (row[0].strip() or row[1].strip()):
+            continue
+        situacao, semestre = row[2].strip(), row[9].strip()
+        if not semestre or not entra_no_cr(situacao, semestre):
+            continue
+        h = _parse_num(row[7]) or 0.0
+        numerador += nota_efetiva(_parse_num(row[4]), _parse_num(row[5]), situacao) * h
+        horas += h
+    return Historico(numerador, horas)
+
+
+@dataclass(slots=True)
+class Coorte:
+    """Históricos de vários alunos como vetores (m,), prontos para simular()."""
+
+    alunos: list[str]
+    numerador: np.ndarray
+    horas: np.ndarray
+
+    @property
+    def cr(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.nan_to_num(self.numerador / self.horas)
+
+
+def arquivos_historico(fontes) -> list[pathlib.Path]:
+    """Expande diretórios em seus .csv (ordem alfabética); arquivos passam direto."""
+    arquivos = []
+    for fonte in map(pathlib.Path, fontes):
+        arquivos.extend(sorted(fonte.glob("*.csv")) if fonte.is_dir() else [fonte])
+    return arquivos
+
+
+def carregar_coorte(fontes) -> Coorte:
+    """Carrega vários históricos (arquivos ou diretórios); o aluno é o nome do arquivo."""
+    arquivos = arquivos_historico(fontes)
+    alunos = [p.stem for p in arquivos]
+    if len(set(alunos)) != len(alunos):
+        repetidos = sorted({a for a in alunos if alunos.count(a) > 1})
+        raise ValueError(f"históricos com o mesmo nome de aluno: {', '.join(repetidos)}")
+    historicos = [carregar_historico(p) for p in arquivos]
+    return Coorte(
+        alunos,
+        np.array([h.numerador for h in historicos], dtype=np.float64),
+        np.array([h.horas for h in historicos], dtype=np.float64),
+    )
+
+
+def carregar_planos(path) -> dict[str, list[str]]:
+    """planos.csv (`aluno;CODIGO1 CODIGO2 ...`) → {aluno: [códigos]}."""
+    planos = {}
+    with pathlib.Path(path).open(encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f, delimiter=";"):
+            if len(row) >= 2 and row[0].strip():
+                planos[row[0].strip()] = row[1].split()
+    return planos
+
+
+def _ch_catalogo(json_path=None) -> dict[str, int]:
+    return {t.codigo: t.ch for t in carregar_turmas(json_path or DEFAULT_JSON) if t.ch}
+
+
+def horas_planejadas(codigos: list[str], json_path=None) -> np.ndarray:
+    """CH de cada disciplina planejada, a partir do catálogo (CH_PADRAO se ausente)."""
+    ch = _ch_catalogo(json_path)
+    return np.array([ch.get(c, CH_PADRAO) for c in codigos], dtype=np.float64)
+
+
+def matriz_planejadas(alunos: list[str], planos: dict[str, list[str]], json_path=None):
+    """(códigos, horas_plan (m, k)) com a CH onde o aluno planeja a disciplina e 0 no resto."""
+    codigos = list(dict.fromkeys(c for a in alunos for c in planos.get(a, ())))
+    coluna = {c: j for j, c in enumerate(codigos)}
+    ch = _ch_catalogo(json_path)
+    horas_plan = np.zeros((len(alunos), len(codigos)), dtype=np.float64)
+    for i, aluno in enumerate(alunos):
+        for c in planos.get(aluno, ()):
+            horas_plan[i, coluna[c]] = ch.get(c, CH_PADRAO)
+    return codigos, horas_plan
+
+
+def amostrar_notas(n: int, k: int, minimo: float = 0.0, maximo: float = 10.0, seed=None) -> np.ndarray:
+    """Matriz (n cenários × k disciplinas) de notas uniformes, arredondadas a 0,1."""
+    rng = np.random.default_rng(seed)
+    return np.round(rng.uniform(minimo, maximo, size=(n, k)), 1)
+
+
+def simular(numerador, horas, horas_plan, notas) -> np.ndarray:
+    """CR final de cada aluno em cada cenário.
+
+    numerador, horas: escalares (um aluno) ou vetores (m alunos).
+    horas_plan: (k,) ou (m, k) — CH planejada; 0 onde o aluno não cursa a disciplina.
+    notas: (n, k) — um cenário de notas por linha.
+    Retorna (n,) para um aluno ou (m, n) para uma coorte.
+    """
+    numerador = np.asarray(numerador, dtype=np.float64)
+    horas = np.asarray(horas, dtype=np.float64)
+    horas_plan = np.atleast_2d(np.asarray(horas_plan, dtype=np.float64))
+    notas = np.asarray(notas, dtype=np.float64)
+
+    ganho = horas_plan @ notas.T                     # (m, n)
+    total = (horas + horas_plan.sum(axis=1))[:, None]  # (m, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cr = (numerador.reshape(-1, 1) + ganho) / total
+    cr = np.nan_to_num(cr)
+    return cr[0] if numerador.ndim == 0 else cr
+
+
+def distribuicao(crs: np.ndarray, alvo: float | None = None) -> dict:
+    """Resumo da distribuição de CR ao longo do último eixo (cenários)."""
+    resumo = {
+        "media": crs.mean(axis=-1),
+        "desvio": crs.std(axis=-1),
+        "percentis": dict(zip(PERCENTIS, np.percentile(crs, PERCENTIS, axis=-1))),
+    }
+    if alvo is not None:
+        resumo["prob_alvo"] = (crs >= alvo).mean(axis=-1)
+    return resumo
+
+
+def nota_minima_uniforme(numerador, horas, horas_plan, alvo: float) -> np.ndarray:
+    """Menor nota igual em todas as planejadas para chegar ao CR alvo.
+
+    Acima de 10 significa inalcançável; abaixo de 0, já garantido.
+    """
+    horas_plan = np.atleast_2d(np.asarray(horas_plan, dtype=np.float64))
+    h = horas_plan.sum(axis=1)
+    numerador = np.asarray(numerador, dtype=np.float64).reshape(-1)
+    horas = np.asarray(horas, dtype=np.float64).reshape(-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = (alvo * (horas + h) - numerador) / h
+    return x[0] if x.size == 1 else x
+
+
+def nota_minima_por_disciplina(numerador, horas, horas_plan, alvo: float, demais: float = 10.0) -> np.ndarray:
+    """Menor nota em cada planejada, com as demais fixas em `demais`, para chegar ao alvo.
+
+    Retorna (k,) para um aluno ou (m, k) para uma coorte; NaN onde a CH é 0.
+    """
+    horas_plan = np.atleast_2d(np.asarray(horas_plan, dtype=np.float64))
+    numerador = np.asarray(numerador, dtype=np.float64).reshape(-1, 1)
+    horas = np.asarray(horas, dtype=np.float64).reshape(-1, 1)
+    h_total = horas_plan.sum(axis=1, keepdims=True)
+    outras = demais * (h_total - horas_plan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = (alvo * (horas + h_total) - numerador - outras) / horas_plan
+    x[horas_plan == 0] = np.nan
+    return x[0] if x.shape[0] == 1 else x
+
+
+def run(historico_path, planejadas, alvo=None, cenarios=10000, nota_min=5.0, seed=None):
+    hist = carregar_historico(historico_path)
+    horas_plan = horas_planejadas(planejadas)
+    notas = amostrar_notas(cenarios, len(planejadas), minimo=nota_min, seed=seed)
+    crs = simular(hist.numerador, hist.horas, horas_plan, notas)
+    resumo = distribuicao(crs, alvo)
+
+    print(f"  CR atual  : {hist.cr:.2f} ({hist.horas:.0f}h)")
+    print(f"  Planejadas: {len(planejadas)} disciplinas, {horas_plan.sum():.0f}h")
+    print(f"  {cenarios} cenários (notas entre {nota_min:g} e 10):")
+    print(f"    média {resumo['media']:.2f} ± {resumo['desvio']:.2f}")
+    print("    " + "  ".join(f"p{p}={v:.2f}" for p, v in resumo["percentis"].items()))
+    if alvo is not None:
+        print(f"  P(CR >= {alvo:g}) = {resumo['prob_alvo']:.1%}")
+        x = nota_minima_uniforme(hist.numerador, hist.horas, horas_plan, alvo)
+        aviso = " (inalcançável)" if x > 10 else " (já garantido)" if x <= 0 else ""
+        print(f"  Nota mínima igual em todas: {max(x, 0):.2f}{aviso}")
+        for codigo, nota in zip(planejadas, nota_minima_por_disciplina(hist.numerador, hist.horas, horas_plan, alvo)):
+            print(f"    {codigo}: {max(nota, 0):.2f} com as demais em 10" + (" (inalcançável)" if nota > 10 else ""))
+
+    return resumo
+
+
+def run_lote(fontes, planejadas=None, planos_path=None, alvo=None, cenarios=10000,
+             nota_min=5.0, seed=None, saida=None):
+    """Simula a coorte inteira de uma vez; `planos_path` (por aluno) ou `planejadas` (todos)."""
+    coorte = carregar_coorte(fontes)
+    if planos_path is not None:
+        planos = carregar_planos(planos_path)
+        sem_historico = sorted(set(planos) - set(coorte.alunos))
+        if sem_historico:
+            print(f"  [!] Aviso: planos sem histórico ignorados: {', '.join(sem_historico)}")
+    else:
+        planos = {aluno: list(planejadas) for aluno in coorte.alunos}
+    codigos, horas_plan = matriz_planejadas(coorte.alunos, planos)
+
+    # Um sorteio por disciplina e cenário, comum a toda a coorte
+    notas = amostrar_notas(cenarios, len(codigos), minimo=nota_min, seed=seed)
+    crs = simular(coorte.numerador, coorte.horas, horas_plan, notas).reshape(len(coorte.alunos), -1)
+    resumo = distribuicao(crs, alvo)
+
+    linhas = []
+    for i, aluno in enumerate(coorte.alunos):
+        linha = {
+            "aluno": aluno,
+            "cr_atual": coorte.cr[i],
+            "horas_planejadas": horas_plan[i].sum(),
+            "media": resumo["media"][i],
+            "desvio": resumo["desvio"][i],
+            **{f"p{p}": v[i] for p, v in resumo["percentis"].items()},
+        }
+        linhas.append(linha)
+
+    if alvo is not None:
+        resumo["nota_minima"] = nota_minima_uniforme(coorte.numerador, coorte.horas, horas_plan, alvo).reshape(-1)
+        resumo["nota_minima_por_disciplina"] = nota_minima_por_disciplina(
+            coorte.numerador, coorte.horas, horas_plan, alvo
+        ).reshape(len(coorte.alunos), -1)
+        for i, linha in enumerate(linhas):
+            linha["prob_alvo"] = resumo["prob_alvo"][i]
+            linha["nota_minima"] = resumo["nota_minima"][i]
+            for codigo, nota in zip(codigos, resumo["nota_minima_por_disciplina"][i]):
+                linha[f"min_{codigo}"] = nota
+
+    print(f"  {len(coorte.alunos)} alunos, {len(codigos)} disciplinas planejadas, "
+          f"{cenarios} cenários (notas entre {nota_min:g} e 10)")
+    for linha in linhas:
+        texto = (f"    {linha['aluno']:<20} CR {linha['cr_atual']:.2f} → "
+                 f"{linha['media']:.2f} ± {linha['desvio']:.2f} (p5 {linha['p5']:.2f}, p95 {linha['p95']:.2f})")
+        if alvo is not None:
+            x = linha["nota_minima"]
+            aviso = ("sem planejadas" if np.isnan(x) or np.isinf(x) else "inalcançável" if x > 10
+                     else "já garantido" if x <= 0 else f"{x:.2f}")
+            texto += f"  P(>= {alvo:g}) {linha['prob_alvo']:.1%}  nota mínima {aviso}"
+        print(texto)
+
+    if saida is not None:
+        campos = list(dict.fromkeys(k for linha in linhas for k in linha))
+        with pathlib.Path(saida).open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=campos, delimiter=";")
+            writer.writeheader()
+            for linha in linhas:
+                writer.writerow({k: _celula(v) for k, v in linha.items()})
+        print(f"  Salvo em {saida}")
+
+    return coorte, codigos, resumo
+
+
+def _celula(valor):
+    """Números com 4 casas; NaN (disciplina que o aluno não planeja) fica vazio."""
+    if isinstance(valor, (float, np.floating)):
+        return "" if np.isnan(valor) else f"{valor:.4f}"
+    return valor
+
+
+def em_lote(historicos, planos=None) -> bool:
+    return len(historicos) > 1 or planos is not None or pathlib.Path(historicos[0]).is_dir()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula cenários de CR a partir de um histórico (ou de uma coorte).")
+    parser.add_argument("historico", nargs="+",
+                        help="histórico em .csv (formato da calculadora de CR); vários ou um diretório = lote")
+    parser.add_argument("--planejadas", nargs="+", default=None, help="códigos das disciplinas planejadas")
+    parser.add_argument("--planos", default=None, help="lote: planos.csv com `aluno;CODIGO1 CODIGO2 ...`")
+    parser.add_argument("--alvo", type=float, default=None, help="CR alvo")
+    parser.add_argument("--cenarios", type=int, default=10000)
+    parser.add_argument("--nota-min", type=float, default=5.0, help="menor nota sorteada (padrão: 5)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--saida", default=None, help="lote: CSV com distribuição e notas mínimas por aluno")
+    args = parser.parse_args()
+    if not args.planejadas and not args.planos:
+        parser.error("informe --planejadas ou --planos")
+    if em_lote(args.historico, args.planos):
+        run_lote(args.historico, args.planejadas, args.planos, args.alvo, args.cenarios,
+                 args.nota_min, args.seed, args.saida)
+    else:
+        run(args.historico[0], args.planejadas, args.alvo, args.cenarios, args.nota_min, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+snapshots.py — histórico colunar das turmas por semestre e curso.
+
+Cada execução do pipeline grava o db_disciplinas.json final como Parquet
+(zstd, strings com dicionário) em docs/snapshots/, particionado no estilo Hive:
+
+    docs/snapshots/anosemestre=20261/curso=4/turmas.parquet
+
+Rodar de novo no mesmo semestre/curso substitui só aquela partição; semestres
+anteriores ficam preservados. As consultas leem apenas as colunas e partições
+necessárias (pyarrow.dataset), sem recarregar dumps JSON inteiros.
+"""
+
+import datetime
+import pathlib
+
+from modelos import DIAS, carregar_turmas
+
+ROOT = pathlib.Path(__file__).parent.parent
+SNAPSHOT_DIR = ROOT / "docs" / "snapshots"
+DEFAULT_JSON = ROOT / "web" / "data" / "db_disciplinas.json"
+ARQUIVO = "turmas.parquet"
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("codigo", pa.string()),
+            ("nome", pa.string()),
+            ("turma", pa.string()),
+            ("docente", pa.string()),
+            ("professor_id", pa.string()),
+            ("nome_exibicao", pa.string()),
+            ("ch", pa.int16()),
+            ("periodo", pa.int8()),
+            ("tipo", pa.string()),
+            *[(dia, pa.string()) for dia in DIAS],
+            ("prerequisitos", pa.list_(pa.string())),
+            ("coletado_em", pa.timestamp("s", tz="UTC")),
+        ]
+    )
+
+
+def _valor(v):
+    return v or None
+
+
+def gravar(anosemestre, curso, json_path=None, snapshot_dir=None) -> pathlib.Path:
+    """Grava (ou substitui) a partição do semestre/curso a partir do JSON final."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    turmas = carregar_turmas(json_path or DEFAULT_JSON)
+    agora = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+
+    colunas = {
+        "codigo": [t.codigo for t in turmas],
+        "nome": [t.nome for t in turmas],
+        "turma": [t.turma for t in turmas],
+        "docente": [_valor(t.docente) for t in turmas],
+        "professor_id": [_valor(t.professor_id) for t in turmas],
+        "nome_exibicao": [_valor(t.nome_exibicao) for t in turmas],
+        "ch": [t.ch for t in turmas],
+        "periodo": [_valor(t.periodo) for t in turmas],
+        "tipo": [_valor(t.tipo) for t in turmas],
+        **{dia: [t.horarios[i] or None for t in turmas] for i, dia in enumerate(DIAS)},
+        "prerequisitos": [list(t.prerequisitos or ()) for t in turmas],
+        "coletado_em": [agora] * len(turmas),
+    }
+    tabela = pa.table(colunas, schema=_schema())
+
+    destino = pathlib.Path(snapshot_dir or SNAPSHOT_DIR) / f"anosemestre={int(anosemestre)}" / f"curso={int(curso)}"
+    destino.mkdir(parents=True, exist_ok=True)
+    path = destino / ARQUIVO
+    pq.write_table(tabela, path, compression="zstd", use_dictionary=True)
+
+    print(f"  [OK] {tabela.num_rows} turmas -> {path.relative_to(ROOT) if path.is_relative_to(ROOT) else path}"
+          f" ({path.stat().st_size / 1024:.1f} KiB)")
+    return path
+
+
+def _dataset(snapshot_dir=None):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(pathlib.Path(snapshot_dir or SNAPSHOT_DIR), format="parquet", partitioning="hive")
+
+
+def semestres(snapshot_dir=None) -> list[int]:
+    """Semestres com snapshot, em ordem (lidos dos nomes das partições)."""
+    base = pathlib.Path(snapshot_dir or SNAPSHOT_DIR)
+    return sorted(int(p.name.split("=", 1)[1]) for p in base.glob("anosemestre=*") if p.is_dir())
+
+
+def consultar(colunas=None, filtro=None, snapshot_dir=None):
+    """Tabela pyarrow só com as colunas/partições pedidas (filtro: pyarrow.compute.Expression)."""
+    return _dataset(snapshot_dir).to_table(columns=colunas, filter=filtro)
+
+
+def turmas_por_codigo(codigo: str, ultimos: int = 6, curso=None, snapshot_dir=None) -> list[dict]:
+    """Turmas de uma disciplina nos últimos N semestres: quem deu, quando e em que horário."""
+    import pyarrow.dataset as ds
+
+    recentes = semestres(snapshot_dir)[-ultimos:]
+    filtro = (ds.field("codigo") == codigo) & ds.field("anosemestre").isin(recentes)
+    if curso is not None:
+        filtro &= ds.field("curso") == int(curso)
+
+    tabela = consultar(
+        ["anosemestre", "curso", "turma", "docente", "ch", *DIAS], filtro, snapshot_dir
+    )
+    # A mesma turma aparece em cada curso que a oferece; uma linha por semestre/turma
+    tabela = tabela.sort_by([("anosemestre", "ascending"), ("turma", "ascending")])
+    vistos = set()
+    linhas = []
+    for linha in tabela.to_pylist():
+        chave = (linha["anosemestre"], linha["turma"])
+        if chave not in vistos:
+            vistos.add(chave)
+            linhas.append(linha)
+    return linhas
+
+
+def carga_docente(anosemestres=None, curso=None, snapshot_dir=None):
+    """Turmas e CH somada por docente em cada semestre (tabela pyarrow ordenada).
+
+    O docente é identificado pelo professor_id (grafias diferentes do mesmo
+    professor somam juntas) e, sem id, pelo nome; a coluna docente é só para exibição.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    filtro = ds.field("docente").is_valid()
+    if anosemestres is not None:
+        filtro &= ds.field("anosemestre").isin(list(anosemestres))
+    if curso is not None:
+        filtro &= ds.field("curso") == int(curso)
+
+    tabela = consultar(["anosemestre", "professor_id", "docente", "codigo", "turma", "ch"], filtro, snapshot_dir)
+    tabela = tabela.append_column("chave", pc.coalesce(tabela["professor_id"], tabela["docente"]))
+    # Deduplica turmas compartilhadas entre cursos antes de somar
+    unicas = tabela.group_by(["anosemestre", "chave", "codigo", "turma"]).aggregate(
+        [("ch", "max"), ("professor_id", "max"), ("docente", "min")]
+    )
+    carga = unicas.group_by(["anosemestre", "chave"]).aggregate(
+        [("turma", "count"), ("ch_max", "sum"), ("professor_id_max", "max"), ("docente_min", "min")]
+    )
+    # Renomeia pelo nome: a ordem das colunas do aggregate mudou entre versões do pyarrow
+    nomes = {"turma_count": "turmas", "ch_max_sum": "ch_total",
+             "professor_id_max_max": "professor_id", "docente_min_min": "docente"}
+    carga = carga.rename_columns([nomes.get(c, c) for c in carga.column_names])
+    carga = carga.select(["anosemestre", "professor_id", "docente", "turmas", "ch_total"])
+    return carga.sort_by([("anosemestre", "ascending"), ("ch_total", "descending")])
+
+
+def run(anosemestre=None, curso=None):
+    """Grava o snapshot do semestre/curso configurados em scrape_uff.py."""
+    if anosemestre is None or curso is None:
+        import scrape_uff
+        anosemestre = anosemestre or scrape_uff.ANOSEMESTRE
+        curso = curso or scrape_uff.ID_CURSO
+    return gravar(anosemestre, curso)
+
+
+def main():
+    run()
+
+
+if __name__ == "__main__":
+    main()
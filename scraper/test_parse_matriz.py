@@ -0,0 +1,191 @@
+"""
+Checagem de parse_matriz.py com um stub da API de mensagens (sem rede, sem chave).
+
+Gera um PDF de 5 páginas em branco, extrai em trechos de 2 páginas com um
+trecho que falha na primeira tentativa e confere que:
+  - só o trecho que falhou é reenviado;
+  - cada trecho após o primeiro leva a última página do anterior;
+  - a cópia mais completa de uma disciplina repetida entre trechos é mantida;
+  - nada é gravado fora do diretório temporário.
+Com trechos que param em max_tokens, confere que o trecho é dividido ao meio
+(ou, com uma página só, reenviado com mais max_tokens) em vez de repetido igual.
+
+Uso:
+    python scraper/test_parse_matriz.py   (ou pytest scraper/test_parse_matriz.py)
+"""
+
+import io
+import json
+import pathlib
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import parse_matriz
+
+
+class _Stream:
+    def __init__(self, texto: str, stop_reason: str = "end_turn"):
+        self.text_stream = iter([texto[: len(texto) // 2], texto[len(texto) // 2:]])
+        self.stop_reason = stop_reason
+
+    def get_final_message(self):
+        return self
+
+
+class _Messages:
+    """Responde por faixa de páginas; as faixas em `falhar` devolvem JSON truncado uma vez.
+
+    As faixas em `truncar` param em max_tokens enquanto o pedido tiver até
+    aquele número de tokens.
+    """
+
+    def __init__(self, falhar: set[str], truncar: dict[str, int]):
+        self.falhar = set(falhar)
+        self.truncar = dict(truncar)
+        self.chamadas: list[str] = []
+        self.max_tokens: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stream(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"][1]["text"]
+        faixa = re.search(r"páginas (\d+) a (\d+)", prompt)
+        chave = f"{faixa.group(1)}-{faixa.group(2)}"
+        with self._lock:
+            self.chamadas.append(chave)
+            self.max_tokens.setdefault(chave, []).append(kwargs["max_tokens"])
+            falha = chave in self.falhar
+            self.falhar.discard(chave)
+        if kwargs["max_tokens"] <= self.truncar.get(chave, 0):
+            yield _Stream('{"disciplinas":[{"codigo":"ECO001","nome":"IN', stop_reason="max_tokens")
+            return
+        if falha:
+            yield _Stream('{"disciplinas":[{"codigo":"ECO0')
+            return
+        yield _Stream(json.dumps(_RESPOSTAS[chave], separators=(",", ":")))
+
+
+class _Client:
+    def __init__(self, falhar=(), truncar=None):
+        self.messages = _Messages(set(falhar), truncar or {})
+
+
+_RESPOSTAS = {
+    "1-2": {
+        "nome_faculdade": "FACULDADE DE ECONOMIA",
+        "numero_curriculo": "123",
+        "horas_obrigatorias": 2400,
+        "carga_horaria_total": 3000,
+        "disciplinas": [
+            {"codigo": "ECO001", "nome": "INTRO", "periodo": 1, "tipo": "obrigatoria",
+             "prerequisitos": [], "corequisitos": []},
+            # Linha quebrada no fim da página 2: período e pré-requisitos incompletos
+            {"codigo": "ECO003", "nome": "TEORIA MACRO", "periodo": None, "tipo": "obrigatoria",
+             "prerequisitos": [], "corequisitos": []},
+        ],
+    },
+    "2-4": {
+        "disciplinas": [
+            {"codigo": "ECO003", "nome": "TEORIA MACROECONOMICA III", "periodo": 3, "tipo": "obrigatoria",
+             "prerequisitos": ["ECO001"], "corequisitos": []},
+            {"codigo": "ECO004", "nome": "ECONOMETRIA", "periodo": 3, "tipo": "obrigatoria",
+             "prerequisitos": [], "corequisitos": []},
+        ],
+    },
+    "4-5": {
+        "disciplinas": [
+            {"codigo": "ECO005", "nome": "OPTATIVA", "periodo": None, "tipo": "optativa",
+             "prerequisitos": [], "corequisitos": []},
+        ],
+    },
+}
+
+
+def _pdf(paginas: int) -> bytes:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(paginas):
+        writer.add_blank_page(width=72, height=72)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_reenvia_so_o_trecho_que_falhou():
+    client = _Client(falhar={"2-4"})
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = pathlib.Path(tmp) / "matriz.pdf"
+        out_path = pathlib.Path(tmp) / "matriz_curricular.json"
+        pdf_path.write_bytes(_pdf(5))
+
+        result = parse_matriz.run(paginas_por_parte=2, workers=3, client=client,
+                                  pdf_path=pdf_path, out_path=out_path)
+        salvo = json.loads(out_path.read_text(encoding="utf-8"))
+
+    # 3 trechos na primeira rodada, depois só o que falhou
+    assert sorted(client.messages.chamadas[:3]) == ["1-2", "2-4", "4-5"]
+    assert client.messages.chamadas[3:] == ["2-4"]
+
+    assert salvo == result
+    assert result["nome_faculdade"] == "FACULDADE DE ECONOMIA"
+    por_codigo = {d["codigo"]: d for d in result["disciplinas"]}
+    assert list(por_codigo) == ["ECO001", "ECO003", "ECO004", "ECO005"]
+    assert por_codigo["ECO003"]["periodo"] == 3
+    assert por_codigo["ECO003"]["prerequisitos"] == ["ECO001"]
+
+
+class _SempreFalha(set):
+    def __contains__(self, item):
+        return True
+
+    def discard(self, item):
+        pass
+
+
+def test_desiste_apos_max_tentativas():
+    client = _Client()
+    client.messages.falhar = _SempreFalha()
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = pathlib.Path(tmp) / "matriz.pdf"
+        out_path = pathlib.Path(tmp) / "matriz_curricular.json"
+        pdf_path.write_bytes(_pdf(3))
+        try:
+            parse_matriz.run(paginas_por_parte=2, client=client, pdf_path=pdf_path, out_path=out_path)
+        except parse_matriz.ExtracaoInvalida as e:
+            assert "1-2" in str(e) and "3-3" in str(e)
+        else:
+            raise AssertionError("esperava ExtracaoInvalida")
+        assert not out_path.exists()
+    assert len(client.messages.chamadas) == 2 * parse_matriz.MAX_TENTATIVAS
+
+
+def test_divide_trecho_truncado():
+    # "1-4" sempre estoura: vira 1-2 e 2-4. "4-5" tem uma página própria (5):
+    # volta com o dobro de max_tokens
+    client = _Client(truncar={"1-4": parse_matriz.MAX_TOKENS, "4-5": parse_matriz.MAX_TOKENS_PARTE})
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = pathlib.Path(tmp) / "matriz.pdf"
+        out_path = pathlib.Path(tmp) / "matriz_curricular.json"
+        pdf_path.write_bytes(_pdf(5))
+        result = parse_matriz.run(paginas_por_parte=4, workers=2, client=client,
+                                  pdf_path=pdf_path, out_path=out_path)
+
+    assert sorted(client.messages.chamadas[:2]) == ["1-4", "4-5"]
+    assert sorted(client.messages.chamadas[2:]) == ["1-2", "2-4", "4-5"]
+    assert client.messages.max_tokens["4-5"] == [parse_matriz.MAX_TOKENS_PARTE, 2 * parse_matriz.MAX_TOKENS_PARTE]
+    assert client.messages.max_tokens["2-4"] == [parse_matriz.MAX_TOKENS_PARTE]
+    assert [d["codigo"] for d in result["disciplinas"]] == ["ECO001", "ECO003", "ECO004", "ECO005"]
+
+
+def main():
+    test_reenvia_so_o_trecho_que_falhou()
+    test_desiste_apos_max_tentativas()
+    test_divide_trecho_truncado()
+    print("[OK] parse_matriz: reenvio só dos trechos com falha, divisão dos truncados, sobreposição e deduplicação.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Checagem de simulador_cr.py contra as regras de web/app/calculadora-cr/CalculadoraCR.tsx.
+
+Um histórico pequeno cobre cada regra da calculadora (nota efetiva com VS,
+exclusões, reprovações na pandemia, semestre "1°/2023", linha sem semestre,
+número com lixo que parseFloat lê pelo prefixo) e o CR esperado é o que a
+calculadora mostra para esse arquivo. Depois confere que a simulação em lote
+de uma coorte dá, aluno a aluno, o mesmo que a simulação individual.
+
+Uso:
+    python scraper/test_simulador_cr.py   (ou pytest scraper/test_simulador_cr.py)
+"""
+
+import pathlib
+import tempfile
+
+import numpy as np
+
+import simulador_cr
+
+CABECALHO = "Código;Nome;Situação;Turma;Nota;VS;Frequência;CH;Créditos;Semestre\n"
+
+# Linha a linha, o que calcularNotaEfetiva / estaExcluida / eCovidReprovado fazem:
+HISTORICO = CABECALHO + (
+    "GAN00145;CALCULO I;Aprovado;A1;8,5;;90;60;4;2019.1\n"              # 8,5 × 60
+    "GAN00146;CALCULO II;Reprovado por nota;A1;3,0;5,0;80;60;4;2019.2\n"  # (3 + 5) / 2 × 60
+    "SEN00067;MICRO I;Reprovado;A1;2,0;;80;60;4;2021.1\n"               # pandemia: fora
+    "SEN00068;MICRO II;Aprovado;A1;5,0;7,0;;30;2;1°/2023\n"             # VS > 6 substitui: 7 × 30
+    "SEN00069;MACRO I;Trancamento;;;;;60;4;2023.1\n"                     # excluída
+    "SEN00070;MACRO II;Aprovado;A1;7,5 - 8,0;;;60;4;2023.2\n"           # parseFloat: 7,5 × 60
+    "SEN00071;HISTORIA;Aprovado;A1;10;;;60;4;\n"                         # sem semestre: fora
+    ";;;;;;;;;\n"
+    "SEN00072;ESTAGIO;Aproveitamento;;9,0;;;45;3;2020.2\n"              # 9 × 45
+)
+NUMERADOR = 8.5 * 60 + 4.0 * 60 + 7.0 * 30 + 7.5 * 60 + 9.0 * 45
+HORAS = 60 + 60 + 30 + 60 + 45
+
+
+def test_cr_igual_calculadora():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "aluno.csv"
+        path.write_text(HISTORICO, encoding="utf-8")
+        hist = simulador_cr.carregar_historico(path)
+
+    assert hist.horas == HORAS
+    assert abs(hist.numerador - NUMERADOR) < 1e-9
+    assert f"{int(hist.cr * 10) / 10:.1f}" == "7.1"  # truncateCR da calculadora
+
+
+def test_coorte_igual_aos_alunos_individuais():
+    planos = {"ana": ["SEN00067", "SEN00076"], "bia": ["SEN00076"], "caio": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = pathlib.Path(tmp)
+        (pasta / "ana.csv").write_text(HISTORICO, encoding="utf-8")
+        (pasta / "bia.csv").write_text(CABECALHO + "GAN00145;CALCULO I;Aprovado;A1;6,0;;;60;4;2024.1\n",
+                                       encoding="utf-8")
+        (pasta / "caio.csv").write_text(CABECALHO, encoding="utf-8")
+        coorte = simulador_cr.carregar_coorte([pasta])
+
+    assert coorte.alunos == ["ana", "bia", "caio"]
+    codigos, horas_plan = simulador_cr.matriz_planejadas(coorte.alunos, planos)
+    assert codigos == ["SEN00067", "SEN00076"]
+    assert horas_plan.shape == (3, 2) and (horas_plan[2] == 0).all() and horas_plan[1, 0] == 0
+
+    notas = simulador_cr.amostrar_notas(500, len(codigos), seed=1)
+    crs = simulador_cr.simular(coorte.numerador, coorte.horas, horas_plan, notas)
+    assert crs.shape == (3, 500)
+    minimas = simulador_cr.nota_minima_por_disciplina(coorte.numerador, coorte.horas, horas_plan, 8.0)
+
+    for i, aluno in enumerate(coorte.alunos):
+        cols = [codigos.index(c) for c in planos[aluno]]
+        sozinho = simulador_cr.simular(coorte.numerador[i], coorte.horas[i], horas_plan[i, cols], notas[:, cols])
+        assert np.allclose(crs[i], sozinho)
+        if cols:
+            assert np.allclose(
+                minimas[i, cols],
+                simulador_cr.nota_minima_por_disciplina(coorte.numerador[i], coorte.horas[i], horas_plan[i, cols], 8.0),
+            )
+        assert np.isnan(np.delete(minimas[i], cols)).all()
+
+
+def main():
+    test_cr_igual_calculadora()
+    test_coorte_igual_aos_alunos_individuais()
+    print("[OK] simulador_cr: CR igual ao da calculadora e coorte igual aos alunos individuais.")
+
+
+if __name__ == "__main__":
+    main()
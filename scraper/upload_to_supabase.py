@@ -6,33 +6,63 @@ Uso:
     python scraper/upload_to_supabase.py
 """
 
-import json
 import pathlib
 import os
-from dotenv import load_dotenv
-from supabase import create_client
 
-ROOT = pathlib.Path(__file__).parent.parent
-load_dotenv(ROOT / ".env")
+from modelos import carregar_turmas
+from resolve_professores import professor_id, tokens
 
-SUPABASE_URL = os.environ["SUPABASE_URL"]
-SUPABASE_KEY = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
+ROOT = pathlib.Path(__file__).parent.parent
 JSON_PATH = ROOT / "web" / "data" / "db_disciplinas.json"
 BATCH_SIZE = 200
 
 
+def _config() -> tuple[str, str]:
+    """Lê SUPABASE_URL e SUPABASE_SERVICE_ROLE_KEY (do .env, se existir) na hora do upload."""
+    from dotenv import load_dotenv
+
+    load_dotenv(ROOT / ".env")
+    return os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_ROLE_KEY"]
+
+
+def _professores_existentes(client) -> list[dict]:
+    """Todas as linhas (id, name) de professors, paginando o limite do PostgREST."""
+    linhas = []
+    inicio = 0
+    while True:
+        pagina = client.table("professors").select("id,name").range(inicio, inicio + 999).execute().data
+        linhas.extend(pagina)
+        if len(pagina) < 1000:
+            return linhas
+        inicio += 1000
+
+
+def migrar_ids(client, profs: dict[str, str]) -> int:
+    """Move linhas com id antigo (ou outra grafia do mesmo nome) para o id estável."""
+    por_chave = {tokens(name): pid for name, pid in profs.items()}
+    migrados = 0
+    for linha in _professores_existentes(client):
+        novo = por_chave.get(tokens(linha["name"]))
+        if novo and novo != linha["id"]:
+            client.rpc("migrar_professor_id", {"antigo": linha["id"], "novo": novo}).execute()
+            migrados += 1
+    return migrados
+
+
 def main():
-    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    from supabase import create_client
 
-    with JSON_PATH.open(encoding="utf-8") as f:
-        materias = json.load(f)
+    supabase_url, supabase_key = _config()
+    client = create_client(supabase_url, supabase_key)
+
+    materias = carregar_turmas(JSON_PATH)
 
     total = len(materias)
     print(f"[INFO] {total} disciplinas carregadas de {JSON_PATH.name}")
 
     enviadas = 0
     for i in range(0, total, BATCH_SIZE):
-        batch = materias[i : i + BATCH_SIZE]
+        batch = [m.to_dict() for m in materias[i : i + BATCH_SIZE]]
         result = client.table("disciplinas").upsert(
             batch,
             on_conflict="codigo,turma",
@@ -43,23 +73,28 @@ def main():
     print(f"\n[OK] {total} disciplinas sincronizadas com o Supabase.")
 
     # ── Sync professores ──────────────────────────────
-    profs = set()
+    # docente já vem canonicalizado por resolve_professores.py
+    profs = {}
     for m in materias:
-        docente = (m.get("docente") or "").strip()
+        docente = (m.docente or "").strip()
         if docente and docente != "Sem professor alocado":
-            profs.add(docente)
+            profs[docente] = m.professor_id or professor_id(docente)
 
-    prof_rows = [{"name": name} for name in sorted(profs)]
+    prof_rows = [{"id": profs[name], "name": name} for name in sorted(profs)]
     total_profs = len(prof_rows)
     print(f"\n[INFO] {total_profs} professores únicos encontrados")
 
+    migrados = migrar_ids(client, profs)
+    if migrados:
+        print(f"  [OK] {migrados} professores migrados para o id estável")
+
+    # Upsert pelo id: uma mudança de grafia canônica só renomeia a linha
     enviados = 0
     for i in range(0, total_profs, BATCH_SIZE):
         batch = prof_rows[i : i + BATCH_SIZE]
         client.table("professors").upsert(
             batch,
-            on_conflict="name",
-            ignore_duplicates=True,
+            on_conflict="id",
         ).execute()
         enviados += len(batch)
         print(f"  [{enviados}/{total_profs}] professors upsert OK")
@@ -3,7 +3,7 @@
 import React, { useState, useEffect, useCallback, useRef } from "react";
 import Link from "next/link";
 import styles from "./ControladorFaltas.module.css";
-import rawCatalog from "@/data/db_disciplinas.json";
+import { fetchDataAsset } from "@/lib/dataAssets";
 import { useUIStore } from "@/stores/useUIStore";
 import { useFaltasStore, type DisciplinaFalta } from "@/stores/useFaltasStore";
 import { useCalculadoraStore } from "@/stores/useCalculadoraStore";
@@ -19,31 +19,33 @@ interface CatalogItem {
   nome_exibicao: string;
 }
 
-const CATALOG: CatalogItem[] = Object.values(
-  (
-    rawCatalog as {
-      codigo: string;
-      nome: string;
-      ch: number | null;
-      horarios: Record<string, string>;
-      nome_exibicao?: string;
-    }[]
-  ).reduce(
-    (acc: Record<string, CatalogItem>, d) => {
-      if (!acc[d.codigo]) {
-        acc[d.codigo] = {
-          codigo: d.codigo,
-          nome: d.nome,
-          ch: d.ch ?? 60,
-          horarios: d.horarios,
-          nome_exibicao: d.nome_exibicao || "",
-        };
-      }
-      return acc;
-    },
-    {}
-  )
-);
+interface RawCatalogItem {
+  codigo: string;
+  nome: string;
+  ch: number | null;
+  horarios: Record<string, string>;
+  nome_exibicao?: string;
+}
+
+function buildCatalog(rawCatalog: RawCatalogItem[]): CatalogItem[] {
+  return Object.values(
+    rawCatalog.reduce(
+      (acc: Record<string, CatalogItem>, d) => {
+        if (!acc[d.codigo]) {
+          acc[d.codigo] = {
+            codigo: d.codigo,
+            nome: d.nome,
+            ch: d.ch ?? 60,
+            horarios: d.horarios,
+            nome_exibicao: d.nome_exibicao || "",
+          };
+        }
+        return acc;
+      },
+      {}
+    )
+  );
+}
 
 /* ── Helpers ─────────────────────────────────────── */
 function buildDisciplinaFaltas(
@@ -77,6 +79,10 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
   const faltasStore = useFaltasStore();
   const disciplinas = faltasStore.disciplinas;
 
+  // Catálogo servido de /data com hash (fora do bundle), carregado no cliente
+  const [catalog, setCatalog] = useState<CatalogItem[]>([]);
+  const [catalogErro, setCatalogErro] = useState(false);
+
   // Banner de migração (snackbar)
   const [bannerShown, setBannerShown] = useState(false);   // controla renderização
   const [bannerIn, setBannerIn] = useState(false);          // controla slide-in/out
@@ -105,6 +111,18 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
 
   useEffect(() => { _hydrateTheme(); }, [_hydrateTheme]);
 
+  const carregarCatalogo = useCallback(() => {
+    setCatalogErro(false);
+    fetchDataAsset<RawCatalogItem[]>("db_disciplinas.json")
+      .then((raw) => setCatalog(buildCatalog(raw)))
+      .catch((err) => {
+        console.error(err);
+        setCatalogErro(true);
+      });
+  }, []);
+
+  useEffect(() => { carregarCatalogo(); }, [carregarCatalogo]);
+
   /* ── Toast ───────────────────────────────── */
   const showToast = useCallback((msg: string) => {
     if (toastTimeoutRef.current) clearTimeout(toastTimeoutRef.current);
@@ -158,14 +176,18 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
   }, [emailModal, modalEmail, closeEmailModal, showToast]);
 
   /* ── Migração a partir das projeções da Calculadora de CR (apenas se faltas vazia) ── */
+  const migracaoFeitaRef = useRef(false);
   useEffect(() => {
+    // Espera o catálogo para pegar CH e horários; roda uma única vez
+    if (catalog.length === 0 || migracaoFeitaRef.current) return;
+    migracaoFeitaRef.current = true;
     if (faltasStore.disciplinas.length > 0) return;
     const projecoes = useCalculadoraStore.getState().disciplinas.filter(
       (d) => d.isProjecao === true
     );
     if (projecoes.length > 0) {
       const migradas = projecoes.map((p) => {
-        const cat = CATALOG.find((c) => c.codigo === p.codigo);
+        const cat = catalog.find((c) => c.codigo === p.codigo);
         return buildDisciplinaFaltas(p.codigo, p.nome, cat);
       });
       faltasStore.setDisciplinas(migradas);
@@ -173,7 +195,7 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
       showBanner();
     }
   // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [catalog]);
 
   /* ── Autocomplete ────────────────────────── */
   const handleBuscaChange = useCallback(
@@ -182,7 +204,7 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
       if (value.length >= 2) {
         const lower = value.toLowerCase();
         const jaAdicionadas = new Set(disciplinas.map((d) => d.codigo));
-        const found = CATALOG.filter(
+        const found = catalog.filter(
           (d) =>
             !jaAdicionadas.has(d.codigo) &&
             !chipsSelecionados.has(d.codigo) &&
@@ -196,7 +218,7 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
         setSugestaoVisivel(false);
       }
     },
-    [disciplinas, chipsSelecionados]
+    [catalog, disciplinas, chipsSelecionados]
   );
 
   const handleSelecionarSugestao = useCallback((item: CatalogItem) => {
@@ -223,13 +245,13 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
     if (chipsSelecionados.size === 0) return;
     const novas: DisciplinaFalta[] = [];
     chipsSelecionados.forEach((nome, codigo) => {
-      const cat = CATALOG.find((c) => c.codigo === codigo);
+      const cat = catalog.find((c) => c.codigo === codigo);
       novas.push(buildDisciplinaFaltas(codigo, nome, cat));
     });
     faltasStore.setDisciplinas([...disciplinas, ...novas]);
     setChipsSelecionados(new Map());
     setBusca("");
-  }, [chipsSelecionados, disciplinas, faltasStore]);
+  }, [catalog, chipsSelecionados, disciplinas, faltasStore]);
 
   /* ── Contador ────────────────────────────── */
   const incrementar = useCallback((codigo: string) => {
@@ -328,7 +350,11 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
               ref={buscaRef}
               type="text"
               className={styles.buscaInput}
-              placeholder="Buscar disciplina por nome ou código..."
+              placeholder={
+                catalog.length > 0 || catalogErro
+                  ? "Buscar disciplina por nome ou código..."
+                  : "Carregando catálogo de disciplinas..."
+              }
               value={busca}
               onChange={(e) => handleBuscaChange(e.target.value)}
               onFocus={() => sugestoes.length > 0 && setSugestaoVisivel(true)}
@@ -354,6 +380,15 @@ export default function ControladorFaltas({ nomeCompletoMap, professorEmailMap }
             )}
           </div>
 
+          {catalogErro && (
+            <p className={styles.catalogoErro} role="alert">
+              Não foi possível carregar o catálogo de disciplinas.{" "}
+              <button className={styles.catalogoRetry} onClick={carregarCatalogo}>
+                Tentar de novo
+              </button>
+            </p>
+          )}
+
           {/* Chips */}
           {chipsSelecionados.size > 0 && (
             <div className={styles.chips}>
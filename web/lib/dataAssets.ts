@@ -0,0 +1,32 @@
+import manifest from "@/data/assets_manifest.json";
+
+export type DataAsset = keyof typeof manifest;
+
+/**
+ * URL com hash de conteúdo de um arquivo de dados, resolvida em tempo de build
+ * a partir do manifest gerado por scraper/export_assets.py. Servida com cache
+ * imutável; a compressão fica por conta do servidor/CDN, que negocia pelo
+ * Accept-Encoding (os .br/.gz ao lado servem a quem entrega pré-comprimidos).
+ */
+export function dataAssetUrl(nome: DataAsset): string {
+  return manifest[nome].path;
+}
+
+const cache = new Map<DataAsset, Promise<unknown>>();
+
+/**
+ * Baixa (uma vez por página) um arquivo de dados pela URL com hash: o JSON
+ * fica fora do bundle JS. Uma falha não fica em cache, então dá para tentar de novo.
+ */
+export function fetchDataAsset<T>(nome: DataAsset): Promise<T> {
+  let pendente = cache.get(nome);
+  if (!pendente) {
+    pendente = fetch(dataAssetUrl(nome)).then((res) => {
+      if (!res.ok) throw new Error(`Falha ao carregar ${nome}: HTTP ${res.status}`);
+      return res.json();
+    });
+    pendente.catch(() => cache.delete(nome));
+    cache.set(nome, pendente);
+  }
+  return pendente as Promise<T>;
+}
@@ -1,4 +1,12 @@
 /** @type {import('next').NextConfig} */
-const nextConfig = {};
+const immutable = { key: "Cache-Control", value: "public, max-age=31536000, immutable" };
+
+const nextConfig = {
+  // Assets gerados por scraper/export_assets.py: o hash no nome muda junto com o conteúdo.
+  // A compressão é negociada pelo servidor/CDN (Accept-Encoding), não forçada aqui.
+  async headers() {
+    return [{ source: "/data/:file*", headers: [immutable] }];
+  },
+};
 
 export default nextConfig;